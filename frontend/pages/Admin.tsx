@@ -62,11 +62,17 @@ const Admin: React.FC = () => {
 
   // Fetch pending queries for approvals
   const fetchPending = async () => {
-    const res = await authenticatedFetch('/api/admin/queries_to_approve');
-    if (res?.ok) {
+    // The endpoint is paginated; follow next_cursor until the last page
+    const pending: PendingQuery[] = [];
+    let cursor: number | null = 0;
+    while (cursor !== null) {
+      const res = await authenticatedFetch(`/api/admin/queries_to_approve?after_id=${cursor}`);
+      if (!res?.ok) return;
       const data = await res.json();
-      setQueries(data.waiting_approvals || []);
+      pending.push(...(data.waiting_approvals || []));
+      cursor = data.next_cursor ?? null;
     }
+    setQueries(pending);
   };
 
   // Fetch registered databases
@@ -2,7 +2,7 @@
 Admin Router
 Admin query approval/rejection endpoints
 """
-from fastapi import APIRouter, Depends, status, HTTPException, Response
+from fastapi import APIRouter, Depends, Query, status, HTTPException, Response
 from typing import List
 from .schemas import (
     AdminApprovalsList, 
@@ -15,47 +15,41 @@ from .schemas import (
     MaskingRulesSaveRequest
 )
 from dependencies import get_admin_service, admin_required
-from .services import AdminService
+from .services import AdminService, APPROVALS_PAGE_SIZE, APPROVALS_MAX_PAGE_SIZE
 from app_database.models import User
 
-router = APIRouter(prefix="/api/admin")
+# admin_required guards every route; FastAPI caches its result per request for endpoints that also inject it
+router = APIRouter(prefix="/api/admin", dependencies=[Depends(admin_required)])
 
 @router.get("/queries_to_approve", response_model=AdminApprovalsList)
 async def get_queries_to_approve(
-    current_admin: User = Depends(admin_required),
+    after_id: int = Query(0, ge=0),
+    limit: int = Query(APPROVALS_PAGE_SIZE, ge=1, le=APPROVALS_MAX_PAGE_SIZE),
     service: AdminService = Depends(get_admin_service)
 ):
     """
-    Returns the list of queries waiting for approval.
+    Returns one page of queries waiting for approval (keyset-paginated on workspace_id).
     """
-    workspaces = await service.get_workspaces_for_approval()
-    return {"waiting_approvals": workspaces}
+    workspaces = await service.get_workspaces_for_approval(after_id, limit)
+    # A full page may have more after it; a short page is the last one
+    next_cursor = workspaces[-1].workspace_id if len(workspaces) == limit else None
+    return {"waiting_approvals": workspaces, "next_cursor": next_cursor}
 
 @router.post("/approve_query/{workspace_id}")
 async def approve_query(
     workspace_id: int,
     approval: ApprovalRequest,
-    current_admin: User = Depends(admin_required),
     service: AdminService = Depends(get_admin_service)
 ):
     """
     Approves and executes the query.
     """
-    # call service approve (sets show_results and query status)
-    result = await service.approve(workspace_id, approval.show_results)
-
-    if result.get("success"):
-        return result
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=result.get("error", "Failed to approve query")
-        )
+    # call service approve (sets show_results and query status); failures raise service exceptions
+    return await service.approve(workspace_id, approval.show_results)
 
 @router.post("/reject_query/{workspace_id}")
 async def reject_query(
     workspace_id: int,
-    current_admin: User = Depends(admin_required),
     service: AdminService = Depends(get_admin_service)
 ):
     """
@@ -92,33 +86,25 @@ async def execute_for_preview(
 @router.post("/add_database")
 async def add_database(
     request: DatabaseAddRequest,
-    current_admin: User = Depends(admin_required),
     service: AdminService = Depends(get_admin_service)
 ):
     """
     Adds a new database to the system.
     """
+    # Failures (duplicates, DB errors) raise service exceptions handled globally
     result = await service.db_addition_service.add_database(
         servername=request.servername,
         database_name=request.database_name,
         tech_name=request.tech_name
     )
-    
-    if result.get("success"):
-        return {
-            "message": result.get("message"),
-            "db_username": result.get("db_username"),
-            "db_password": result.get("db_password")
-        }
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=result.get("error", "Failed to add database")
-        )
+    return {
+        "message": result.get("message"),
+        "db_username": result.get("db_username"),
+        "db_password": result.get("db_password")
+    }
 
 @router.get("/databases", response_model=DatabaseListResponse)
 async def list_databases(
-    current_admin: User = Depends(admin_required),
     service: AdminService = Depends(get_admin_service)
 ):
     """
@@ -151,7 +137,6 @@ async def discover_schema(
 @router.get("/databases/{database_id}/masking_rules", response_model=List[MaskingRuleSchema])
 async def get_masking_rules(
     database_id: int,
-    current_admin: User = Depends(admin_required),
     service: AdminService = Depends(get_admin_service)
 ):
     """
@@ -172,7 +157,6 @@ async def get_masking_rules(
 async def save_masking_rules(
     database_id: int,
     request: MaskingRulesSaveRequest,
-    current_admin: User = Depends(admin_required),
     service: AdminService = Depends(get_admin_service)
 ):
     """
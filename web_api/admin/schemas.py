@@ -2,7 +2,7 @@
 Admin Schemas
 Pydantic models for admin approval endpoints
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from typing import Dict, Any
 
@@ -20,6 +20,8 @@ class AdminApprovals(BaseModel):
         risk_type: Risk type (optional, from analyzer)
         servername: Target SQL Server (optional)
     """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     user_id: int
     workspace_id: int
     username: str
@@ -30,8 +32,17 @@ class AdminApprovals(BaseModel):
     servername: Optional[str] = None
 
 class AdminApprovalsList(BaseModel):
-    """Admin approval list response schema"""
+    """
+    Admin approval list response schema (one page)
+
+    Attributes:
+        waiting_approvals: Approvals on this page, ordered by workspace_id
+        next_cursor: Pass as after_id to fetch the next page; None on the last page
+    """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     waiting_approvals: List[AdminApprovals]
+    next_cursor: Optional[int] = None
 
 
 class AdminPreviewResponse(BaseModel):
@@ -46,6 +57,8 @@ class AdminPreviewResponse(BaseModel):
         message: Optional message (e.g. "truncated to MAX_ROW_COUNT")
         error: Error message (if any)
     """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     response_type: str  # "data" or "error"
     data: List[Dict[str, Any]]
     columns: Optional[List[str]] = None
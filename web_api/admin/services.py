@@ -2,14 +2,18 @@
 Admin Service Layer
 Admin approval and management operations for risky queries
 """
-from sqlalchemy import inspect, delete
+import time
+import weakref
+from datetime import datetime
+from sqlalchemy import inspect, delete, update, insert, literal, literal_column, bindparam, lambda_stmt
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.sql import select, text
 from typing import Any
 from app_database.models import QueryData, Workspace, User, Databases, MaskingRule
 from app_database.app_database import AppDatabase
 from database_provider import DatabaseProvider
 from .schemas import AdminApprovals
-from query_execution import config
+from query_execution.config import MAX_ROW_COUNT_LIMIT
 
 import logging
 from common.exceptions import BaseServiceException
@@ -19,10 +23,67 @@ from common.security import generate_secure_credentials
 
 logger = logging.getLogger(__name__)
 
+# _approvals_cache is invalidated in-process only: mark_approvals_changed bumps this process's
+# AppDatabase.approvals_version (workspaces, query execution, admin actions and the Slack listener
+# task all run here). A change made by another uvicorn worker, or by any other process writing
+# QueryData, does not reach this version; this process serves the old first page until the TTL expires.
+APPROVALS_CACHE_TTL_SECONDS = 2.0
+
+# Default and maximum number of pending approvals returned per page
+APPROVALS_PAGE_SIZE = 50
+APPROVALS_MAX_PAGE_SIZE = 500
+
+# Single JOIN projecting only the columns AdminApprovals needs (avoids N+1 and wide rows).
+# Built once as a lambda_stmt so the statement construct and its compiled SQL are reused across calls.
+# Keyset-paginated on Workspace.id: :after_id is the last workspace_id of the previous page.
+# The status is rendered inline, not bound: SQL Server only considers the filtered index
+# ix_querydata_status_pending when the predicate matches its filter at compile time.
+_PENDING_APPROVALS_STMT = lambda_stmt(
+    lambda: select(
+        QueryData.user_id,
+        Workspace.id,
+        User.username,
+        QueryData.query,
+        QueryData.database_name,
+        QueryData.status,
+        QueryData.risk_type,
+        QueryData.servername
+    )
+    .join(QueryData.workspace)
+    .join(QueryData.user)
+    .where(
+        QueryData.status == literal_column("'waiting_for_approval'"),
+        Workspace.id > bindparam("after_id")
+    )
+    .order_by(Workspace.id)
+    .limit(bindparam("limit"))
+)
+
+# AppDatabase -> (approvals_version, monotonic timestamp, first approvals page). Only the default first page
+# (what the admin panel polls) is cached, so arbitrary after_id/limit values cannot grow the cache.
+_approvals_cache: "weakref.WeakKeyDictionary[AppDatabase, tuple[int, float, list[AdminApprovals]]]" = weakref.WeakKeyDictionary()
+
+def _preview_response(response_type: str, data: list[dict[str, Any]], columns: list[str], row_count: int,
+                      message: str | None, error: str | None) -> dict[str, Any]:
+    """
+    Builds an execute_for_preview payload (AdminPreviewResponse shape) with one fixed key order.
+    """
+    return {
+        "response_type": response_type,
+        "data": data,
+        "columns": columns,
+        "row_count": row_count,
+        "message": message,
+        "error": error
+    }
+
 class BaseAdminService:
     """
     Base class for all admin services.
     Manages database connections for subclasses.
+
+    Sub-services share the AppDatabase connection pool; each operation opens a short-lived
+    session via app_db.get_app_db() and returns the connection to the pool on exit.
     """
     def __init__(self, app_db: AppDatabase, db_provider: DatabaseProvider):
         self.app_db = app_db
@@ -50,8 +111,8 @@ class AdminService(BaseAdminService):
     # We define the methods used in the router as wrappers here
     # So we don't have to change the router code.
 
-    async def get_workspaces_for_approval(self):
-        return await self.approval_service.get_workspaces_for_approval()
+    async def get_workspaces_for_approval(self, after_id: int = 0, limit: int = APPROVALS_PAGE_SIZE):
+        return await self.approval_service.get_workspaces_for_approval(after_id, limit)
 
     async def execute_for_preview(self, workspace_id: int, admin_user: User):
         return await self.approval_service.execute_for_preview(workspace_id, admin_user)
@@ -75,8 +136,11 @@ class AdminService(BaseAdminService):
             servername = db_entry.servername
             database_name = db_entry.database_name
             
-        db_info = await self.app_db.get_db_info()
-        self.db_provider.set_db_info(db_info)
+        # db_info is refreshed by add_database; only re-read it when the target was registered elsewhere
+        # (e.g. by another worker process) and is not known here yet
+        if database_name not in self.db_provider.db_info.get(servername, {}).get("databases", []):
+            db_info = await self.app_db.get_db_info()
+            self.db_provider.set_db_info(db_info)
         
         try:
             async with self.db_provider.get_session(admin_user, servername, database_name) as session:
@@ -151,159 +215,191 @@ class AdminApprovalService(BaseAdminService):
     Sub-service handling admin approval operations.
     """
 
-    async def get_workspaces_for_approval(self):
+    async def get_workspaces_for_approval(self, after_id: int = 0, limit: int = APPROVALS_PAGE_SIZE):
         """
-        Retrieves workspaces waiting for admin approval.
+        Retrieves one page of workspaces waiting for admin approval, ordered by workspace ID.
+
+        Args:
+            after_id: Return workspaces with an ID greater than this (last workspace_id of the previous page).
+            limit: Page size, capped at APPROVALS_MAX_PAGE_SIZE.
+
+        The default first page is cached per AppDatabase until a status change bumps approvals_version
+        or APPROVALS_CACHE_TTL_SECONDS elapses; other pages always go to the database.
         """
-        result_list = []
+        limit = min(limit, APPROVALS_MAX_PAGE_SIZE)
+        cacheable: bool = after_id == 0 and limit == APPROVALS_PAGE_SIZE
+        version = self.app_db.approvals_version
+        if cacheable:
+            cached = _approvals_cache.get(self.app_db)
+            if cached and cached[0] == version and time.monotonic() - cached[1] < APPROVALS_CACHE_TTL_SECONDS:
+                return cached[2]
+
         try:
             async with self.app_db.get_app_db() as db:
-                results = await db.execute(select(QueryData).where(QueryData.status == "waiting_for_approval"))
-                queries = results.scalars().all()
-                if queries:
-                    for query in queries:
-                       
-                        workspace_result = await db.execute(
-                            select(Workspace).where(Workspace.query_id == query.id)
-                        )
-                        workspace = workspace_result.scalars().first()
-
-                        user_result = await db.execute(select(User).where(User.id == query.user_id))
-                        user = user_result.scalars().first()
-                        
-                        if workspace and user:
-                            data = AdminApprovals(
-                                user_id=query.user_id,
-                                workspace_id=workspace.id,
-                                username = user.username,
-                                query= query.query,
-                                database=query.database_name,
-                                status= query.status,
-                                risk_type=query.risk_type,
-                                servername=query.servername
-                            )
-
-                            result_list.append(data)
-            return result_list
-        except  Exception as e:
-            print(f"Error: {str(e)}")
+                rows = (await db.execute(_PENDING_APPROVALS_STMT, {"after_id": after_id, "limit": limit})).all()
+                approvals = [
+                    AdminApprovals(
+                        user_id=user_id,
+                        workspace_id=workspace_id,
+                        username=username,
+                        query=query,
+                        database=database_name,
+                        status=status,
+                        risk_type=risk_type,
+                        servername=servername
+                    )
+                    for user_id, workspace_id, username, query, database_name, status, risk_type, servername in rows
+                ]
+        except Exception as e:
+            logger.exception(f"Failed to fetch workspaces waiting for approval: {e}")
             return []
+
+        # Stored under the version read before the query, so a concurrent change is never masked
+        if cacheable:
+            _approvals_cache[self.app_db] = (version, time.monotonic(), approvals)
+        return approvals
         
     async def execute_for_preview(self, workspace_id: int, admin_user: User):
         """
         Executes and previews the query for the admin.
         """
-        log_id = None
-        
         async with self.app_db.get_app_db() as db:
-            workspace_result = await db.execute(select(Workspace).where(Workspace.id == workspace_id))
-            workspace = workspace_result.scalars().first()
-            if not workspace:
-                return {"success": False, "error": "Workspace not found"}
-                    
-            query_result = await db.execute(select(QueryData).where(QueryData.id == workspace.query_id))
-            query_data = query_result.scalars().first()
+            # Workspace and its QueryData in one round-trip; admin_user is already loaded by auth
+            query_data: QueryData | None = (await db.execute(
+                select(QueryData)
+                .join(Workspace, Workspace.query_id == QueryData.id)
+                .where(Workspace.id == workspace_id)
+            )).scalars().first()
             if not query_data:
-                return {"success": False, "error": "Query data not found"}
-                    
-            user_result = await db.execute(select(User).where(User.id == admin_user.id))
-            user = user_result.scalars().first()
-            if not user:
-                return {"success": False, "error": "User not found"}
-            
+                raise WorkspaceNotFoundError("Workspace not found")
+
             query_text = query_data.query
             servername = query_data.servername
             database_name = query_data.database_name
         
+        # The start record is committed before the target database is touched: an unlogged query must not run
+        query_date: datetime = datetime.now()
+        log_id: int = await self.app_db.create_log(
+            user=admin_user,
+            query=query_text,
+            machine_name=servername,
+            query_date=query_date
+        )
+
         try:
-            log_id = await self.app_db.create_log(
-                user=admin_user, 
-                query=query_text, 
-                machine_name=servername
-            )
-            
-            async with self.db_provider.get_session(user, servername, database_name) as session:
+            async with self.db_provider.get_session(admin_user, servername, database_name) as session:
+                # Run exactly the text that was analyzed and is being approved; the row cap is applied by fetchmany
                 sql_query = text(query_text)
-                result = await session.execute(sql_query)
+
+                def run_preview(connection) -> tuple[list | None, list[str], int | None]:
+                    # The async execute() buffers every row the driver returns and rejects stream_results,
+                    # so run on the sync connection and stop at the limit. This bounds the rows turned into
+                    # Python objects, not the work done by the target: the statement runs unmodified, and
+                    # closing the result does not discard the remainder on the server. asyncpg fetches it
+                    # in batches through a server-side cursor, aiomysql's SSCursor reads and drops the rest
+                    # on close, and aioodbc has no server-side cursor at all.
+                    result = connection.execute(sql_query, execution_options={"stream_results": True})
+                    if not result.returns_rows:
+                        return None, [], result.rowcount
+                    try:
+                        # One extra row detects truncation
+                        return result.fetchmany(MAX_ROW_COUNT_LIMIT + 1), list(result.keys()), None
+                    finally:
+                        result.close()
+
+                connection = await session.connection()
+                rows, columns, affected = await connection.run_sync(run_preview)
                 
                 row_count: int = 0
                 message: str | None = None
                 result_data: list[dict[str, Any]] = []
-                columns: list[str] = []
                 
-                if result.returns_rows:
-                    rows = result.fetchmany(size=config.MAX_ROW_COUNT_LIMIT)
+                if rows is not None:
+                    truncated: bool = len(rows) > MAX_ROW_COUNT_LIMIT
+                    if truncated:
+                        rows = rows[:MAX_ROW_COUNT_LIMIT]
                     row_count = len(rows)
-                    result_data = [dict(row._mapping) for row in rows]
-                    columns = list(result_data[0].keys()) if result_data else []
-                    if row_count >= config.MAX_ROW_COUNT_LIMIT:
-                        message = f"Truncated to MAX_ROW_COUNT_LIMIT ({config.MAX_ROW_COUNT_LIMIT})"
+                    # Zip plain tuples against the shared key list instead of building a RowMapping per row
+                    result_data = [dict(zip(columns, row)) for row in rows]
+                    if truncated:
+                        message = f"Truncated to MAX_ROW_COUNT_LIMIT ({MAX_ROW_COUNT_LIMIT})"
                     else:
                         message = f"{row_count} rows returned"
                 else:
-                    row_count = result.rowcount if result.rowcount is not None else 0
+                    row_count = affected if affected is not None else 0
                     message = f"{row_count} rows affected"
-                    result_data = []
-                    columns = []
-            
-            await self.app_db.update_log(
-                log_id=log_id,
-                successfull=True,
-                row_count=row_count
-            )
-
-            return {
-                "response_type": "data",
-                "data": result_data,
-                "columns": columns,
-                "row_count": row_count,
-                "message": message,
-                "error": None
-            }
         except Exception as e:
-            if log_id:
-                await self.app_db.update_log(
-                    log_id=log_id,
-                    successfull=False,
-                    error=str(e)
-                )
+            self.app_db.update_log_in_background(log_id=log_id, successfull=False, error=str(e))
+
+            logger.exception(f"Query preview failed for workspace {workspace_id}: {e}")
+            return _preview_response("error", [], [], 0, None, str(e))
 
-            print(f"Query preview failed: {e}")
-            return {
-                "response_type": "error",
-                "data": [],
-                "columns": [],
-                "row_count": 0,
-                "message": None,
-                "error": str(e)
-            }
+        # The start record is already committed; the outcome update is off the response path
+        self.app_db.update_log_in_background(log_id=log_id, successfull=True, row_count=row_count, query_date=query_date)
+
+        return _preview_response("data", result_data, columns, row_count, message, None)
+
+    async def _set_workspace_status(self, workspace_id: int, status: str, **workspace_values) -> bool:
+        """
+        Sets the query status and the given Workspace columns of a workspace in one transaction.
+
+        No rows are loaded into the session. pool_pre_ping is off for the app DB, so a pooled
+        connection that died while idle surfaces here; the transaction is retried once on a fresh one.
+
+        Returns:
+            bool: False if the workspace does not exist.
+        """
+        for attempt in range(2):
+            async with self.app_db.get_app_db() as db:
+                try:
+                    # 1. UPDATE ... FROM Workspaces: resolves the workspace and updates its query in one statement.
+                    # Workspaces.query_id is a non-null FK, so no match means the workspace does not exist.
+                    query_update = await db.execute(
+                        update(QueryData)
+                        .where(QueryData.id == Workspace.query_id, Workspace.id == workspace_id)
+                        .values(status=status)
+                        .execution_options(synchronize_session=False)
+                    )
+                    if query_update.rowcount == 0:
+                        return False
+
+                    # 2. Update the workspace in the same transaction.
+                    # Kept as a separate statement: MSSQL and SQLite cannot update two tables in one
+                    # UPDATE, and multi-statement batches are not portable across the app DB drivers.
+                    await db.execute(
+                        update(Workspace)
+                        .where(Workspace.id == workspace_id)
+                        .values(**workspace_values)
+                        .execution_options(synchronize_session=False)
+                    )
+
+                    await db.commit()
+                except DBAPIError as e:
+                    await db.rollback()
+                    if e.connection_invalidated and attempt == 0:
+                        logger.warning(f"App DB connection lost while updating workspace {workspace_id}, retrying")
+                        continue
+                    raise
+                except Exception:
+                    await db.rollback()
+                    raise
+
+            self.app_db.mark_approvals_changed()
+            return True
 
     async def reject_query_by_workspace_id(self, workspace_id: int):
         """
         Rejects the query.
         """
-        async with self.app_db.get_app_db() as db:
-            try:
-                workspace_result = await db.execute(select(Workspace).where(Workspace.id == workspace_id))
-                workspace = workspace_result.scalars().first()
-                if not workspace:
-                    return {"success": False, "error": "Workspace not found"}
-                    
-                query_result = await db.execute(select(QueryData).where(QueryData.id == workspace.query_id))
-                query_data = query_result.scalars().first()
-                if not query_data:
-                    return {"success": False, "error": "Query data not found"}
-                
-                query_data.status = "rejected"
-                workspace.description = "Rejected by admin"
-                
-                await db.commit()
-                return {"success": True}
-                
-            except Exception as e:
-                await db.rollback()
-                print(f"Error rejecting query: {e}")
-                return {"success": False, "error": str(e)}
+        try:
+            updated = await self._set_workspace_status(workspace_id, "rejected", description="Rejected by admin")
+        except Exception as e:
+            logger.exception(f"Rejection failed for workspace {workspace_id}: {e}")
+            return {"success": False, "error": str(e)}
+
+        if not updated:
+            return {"success": False, "error": "Workspace not found"}
+        return {"success": True}
             
     async def approve(self, workspace_id: int, show_results: bool) -> dict[str, Any]:
         """
@@ -316,49 +412,30 @@ class AdminApprovalService(BaseAdminService):
         Returns:
             dict[str, any]: A dictionary indicating success and the new query status.
         """
-        async with self.app_db.get_app_db() as db:
-            try:
-                # 1. Fetch workspace by ID
-                workspace_result = await db.execute(select(Workspace).where(Workspace.id == workspace_id))
-                workspace: Workspace | None = workspace_result.scalars().first()
-                if not workspace:
-                    raise WorkspaceNotFoundError("Workspace not found")
-                
-                # 2. Fetch related QueryData
-                query_result = await db.execute(select(QueryData).where(QueryData.id == workspace.query_id))
-                query_data: QueryData | None = query_result.scalars().first()
-                if not query_data:
-                    raise WorkspaceNotFoundError("Query data not found for this workspace")
-                
-                # 3. Update status and description
-                new_status: str = ""
-                new_desc: str = ""
-                if show_results:
-                    new_status = "approved_with_results"
-                    new_desc = "Approved by admin - User can execute"
-                    workspace.show_results = True
-                else:
-                    new_status = "approved"
-                    new_desc = "Approved by admin - User cannot execute"
-                    workspace.show_results = False
-                
-                query_data.status = new_status
-                workspace.description = new_desc
-                
-                await db.commit()
-                
-                logger.info(f"Query in workspace {workspace_id} approved by admin (Executable: {show_results})")
-                return {
-                    "success": True,
-                    "status": new_status,
-                    "message": f"Query approved successfully ({'executable' if show_results else 'not executable'})"
-                }
-            except BaseServiceException:
-                raise
-            except Exception as e:
-                await db.rollback()
-                logger.error(f"Approval failed for workspace {workspace_id}: {e}")
-                raise BaseServiceException(f"Approval failed: {str(e)}", original_exception=e)
+        if show_results:
+            new_status: str = "approved_with_results"
+            new_desc: str = "Approved by admin - User can execute"
+        else:
+            new_status = "approved"
+            new_desc = "Approved by admin - User cannot execute"
+
+        try:
+            updated = await self._set_workspace_status(
+                workspace_id, new_status, show_results=show_results, description=new_desc
+            )
+        except Exception as e:
+            logger.error(f"Approval failed for workspace {workspace_id}: {e}")
+            raise BaseServiceException(f"Approval failed: {str(e)}", original_exception=e)
+
+        if not updated:
+            raise WorkspaceNotFoundError("Workspace not found")
+
+        logger.info(f"Query in workspace {workspace_id} approved by admin (Executable: {show_results})")
+        return {
+            "success": True,
+            "status": new_status,
+            "message": f"Query approved successfully ({'executable' if show_results else 'not executable'})"
+        }
 
 class AdminDBAdditionService(BaseAdminService):
     """
@@ -376,27 +453,35 @@ class AdminDBAdditionService(BaseAdminService):
         Returns:
             dict[str, any]: A dictionary containing execution status and a message or error.
         """
-        async with self.app_db.get_app_db() as db:
-            try:
-                # Check if it already exists
-                existing = await db.execute(select(Databases).where(
-                    Databases.servername == servername, 
-                    Databases.database_name == database_name
-                ))
-                existing_db: Databases | None = existing.scalars().first()
-                if existing_db:
-                    raise DatabaseAlreadyExistsError("Database already exists")
+        db_username, db_password = generate_secure_credentials()
 
-                db_username, db_password = generate_secure_credentials()
+        # INSERT ... SELECT ... WHERE NOT EXISTS: the duplicate check and the insert are one statement
+        # (no SELECT round-trip before it); zero affected rows means the database is already registered.
+        # Two concurrent inserts can both pass the check; ux_databases_server_database rejects the second.
+        new_row = select(
+            literal(servername, Databases.servername.type),
+            literal(database_name, Databases.database_name.type),
+            literal(tech_name, Databases.technology.type),
+            literal(db_username, Databases.db_username.type),
+            literal(db_password, Databases.db_password.type)
+        ).where(
+            ~select(Databases.id).where(
+                Databases.servername == servername,
+                Databases.database_name == database_name
+            ).correlate(None).exists()
+        )
 
-                database: Databases = Databases(
-                    servername=servername, 
-                    database_name=database_name, 
-                    technology=tech_name,
-                    db_username=db_username,
-                    db_password=db_password
+        async with self.app_db.get_app_db() as db:
+            try:
+                insert_result = await db.execute(
+                    insert(Databases).from_select(
+                        ["servername", "database_name", "technology", "db_username", "db_password"],
+                        new_row
+                    )
                 )
-                db.add(database)
+                if insert_result.rowcount == 0:
+                    await db.rollback()
+                    raise DatabaseAlreadyExistsError("Database already exists")
                 await db.commit()
                 
                 # Refresh db_provider db_info dynamically
@@ -412,6 +497,9 @@ class AdminDBAdditionService(BaseAdminService):
                 }
             except BaseServiceException:
                 raise
+            except IntegrityError as e:
+                await db.rollback()
+                raise DatabaseAlreadyExistsError("Database already exists") from e
             except Exception as e:
                 await db.rollback()
                 logger.error(f"Error adding database: {e}")
@@ -3,6 +3,7 @@ WebQuery API - New Modular Architecture
 Clean dependency injection with AppDatabase and DatabaseProvider
 """
 import os
+import sys
 from dotenv import load_dotenv
 import asyncio
 
@@ -16,16 +17,16 @@ setup_logging()
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from common.exceptions import BaseServiceException
+from common.responses import ORJSONResponse
 from middlewares.trace_middleware import TraceMiddleware
 import logging
 from contextlib import asynccontextmanager
 from slowapi import _rate_limit_exceeded_handler
-from slowapi.middleware import SlowAPIMiddleware
 from slowapi.errors import RateLimitExceeded
 from common.limiter import limiter
 import uvicorn
 from starlette.middleware.cors import CORSMiddleware
-from sqlalchemy import text
+from starlette.middleware.gzip import GZipMiddleware
 
 from app_database import AppDatabase
 from database_provider import DatabaseProvider
@@ -33,27 +34,36 @@ from middlewares import AuthMiddleware
 
 from slack_integration import SlackListener
 
+from authentication.router import router as auth_router
+from query_execution.router import router as query_router
+from admin.router import router as admin_router
+from workspaces.router import router as workspace_router
+
+logger = logging.getLogger("web_api")
+
+DEBUG = os.getenv("DEBUG", "True").lower() == "true"
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Manages application startup and shutdown lifecycle.
     """
     # Startup
-    print("🚀 Application starting...")
+    logger.info("Application starting...")
     
     try:
         app.state.app_db = AppDatabase()
-        # Real connection test
-        async with app.state.app_db.app_engine.connect() as conn:
-            await conn.execute(text("SELECT 1"))
-        print("✓ AppDatabase connection successful")
+        # Real connection test; also fills the pool so the first requests skip connection setup
+        await app.state.app_db.warm_up()
+        logger.info("AppDatabase connection successful")
         await app.state.app_db.create_tables()
-        print("✓ Tables created/checked")
+        logger.info("Tables created/checked")
     except Exception as e:
-        print(f"\n❌ FATAL: AppDatabase connection error!")
-        print(f"   Error: {type(e).__name__}: {e}")
-        print(f"   Please check the APP_DATABASE_URL environment variable")
-        print(f"   Application cannot start!\n")
+        logger.critical(
+            "FATAL: AppDatabase connection error! %s: %s. "
+            "Please check the APP_DATABASE_URL environment variable. Application cannot start!",
+            type(e).__name__, e
+        )
         await app.state.app_db.app_engine.dispose() if hasattr(app.state, 'app_db') else None
         raise SystemExit(1)
     
@@ -62,70 +72,123 @@ async def lifespan(app: FastAPI):
         # Start Slack Listener (Socket Mode)
         app.state.slack_listener = SlackListener(app_db=app_db)
         slack_listener = app.state.slack_listener
-        asyncio.create_task(slack_listener.start())
+        app.state.slack_task = asyncio.create_task(slack_listener.start(), name="slack_listener")
 
     except Exception as e:
-        print(f"⚠️ Slack integration could not be started: {e}")
-        print("   Slack features will be disabled, but the application will continue to run.")
+        logger.warning(
+            "Slack integration could not be started: %s. "
+            "Slack features will be disabled, but the application will continue to run.", e
+        )
 
     try:
         app.state.db_provider = DatabaseProvider()
         db_info = await app.state.app_db.get_db_info()
         app.state.db_provider.set_db_info(db_info)
         await app.state.db_provider.start_cache_loop()
-        print("✓ DatabaseProvider ready, db_info loaded, and cache loop started")
+        logger.info("DatabaseProvider ready, db_info loaded, and cache loop started")
     except Exception as e:
-        print(f"\n❌ FATAL: DatabaseProvider initialization error!")
-        print(f"   Error: {type(e).__name__}: {e}")
-        print(f"   Please check the SQL_SERVER_NAMES environment variable and SQL Server connections")
-        print(f"   Application cannot start!\n")
+        logger.critical(
+            "FATAL: DatabaseProvider initialization error! %s: %s. "
+            "Please check the SQL_SERVER_NAMES environment variable and SQL Server connections. Application cannot start!",
+            type(e).__name__, e
+        )
         # Cleanup
         await app.state.app_db.app_engine.dispose()
         raise SystemExit(1)
 
-    print("All services started successfully\n")
+    async def warm_up_pending_targets():
+        # Best effort: a failed lookup only skips the warm-up, it must not stop startup
+        try:
+            pending_targets = await app.state.app_db.get_pending_query_targets()
+            await app.state.db_provider.warm_up(pending_targets)
+        except Exception as e:
+            logger.warning("Connection warm-up for pending approvals skipped: %s", e)
+
+    # Pre-open connections to targets with pending approvals in the background
+    app.state.warmup_task = asyncio.create_task(warm_up_pending_targets(), name="connection_warmup")
+
+    logger.info("All services started successfully")
 
     try:
         yield
     finally:
-        print("\nApplication shutting down...")
-        try:
-            if hasattr(app.state, 'db_provider') and app.state.db_provider:
-                await app.state.db_provider.close_engines()
-                print("✓ DatabaseProvider connections closed")
-        except Exception as e:
-            print(f"DatabaseProvider shutdown error: {e}")
+        logger.info("Application shutting down...")
+        warmup_task = getattr(app.state, 'warmup_task', None)
+        if warmup_task and not warmup_task.done():
+            warmup_task.cancel()
+
+        # Stop the Slack socket before the app DB pool its handlers use is disposed
+        slack_task = getattr(app.state, 'slack_task', None)
+        if slack_task and not slack_task.done():
+            slack_task.cancel()
+            await asyncio.wait([slack_task], timeout=5)
         try:
-            if hasattr(app.state, 'app_db') and app.state.app_db:
-                await app.state.app_db.app_engine.dispose()
-                print("✓ AppDatabase connection closed")
+            if getattr(app.state, 'slack_listener', None):
+                await app.state.slack_listener.stop()
         except Exception as e:
-            print(f"AppDatabase shutdown error: {e}")
-        print("Shutdown complete")
+            logger.exception("Slack listener shutdown error: %s", e)
+
+        async def close_db_provider():
+            try:
+                if hasattr(app.state, 'db_provider') and app.state.db_provider:
+                    await app.state.db_provider.close_engines()
+                    logger.info("DatabaseProvider connections closed")
+            except Exception as e:
+                logger.exception("DatabaseProvider shutdown error: %s", e)
+
+        async def close_app_db():
+            try:
+                if hasattr(app.state, 'app_db') and app.state.app_db:
+                    # Flush fire-and-forget audit log writes before closing the pool
+                    await app.state.app_db.drain_log_tasks()
+                    await app.state.app_db.app_engine.dispose()
+                    logger.info("AppDatabase connection closed")
+            except Exception as e:
+                logger.exception("AppDatabase shutdown error: %s", e)
+
+        # The two pools are independent; dispose them concurrently to shorten shutdown
+        await asyncio.gather(close_db_provider(), close_app_db())
+        logger.info("Shutdown complete")
 
 app = FastAPI(
     title="WebQuery API",
     description="Modular SQL Query Execution Platform",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # No Swagger/ReDoc/OpenAPI schema in production (DEBUG=False); the schema is never built there
+    docs_url="/docs" if DEBUG else None,
+    redoc_url="/redoc" if DEBUG else None,
+    openapi_url="/openapi.json" if DEBUG else None,
+    # Routes returning plain dicts/models are rendered with orjson instead of json.dumps
+    default_response_class=ORJSONResponse
 )
 
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# No SlowAPIMiddleware: no default limits are configured, so it only added a BaseHTTPMiddleware hop
+# to every request. Rate limits are enforced by the @limiter.limit decorators on the routes that need them.
+if os.getenv("PROFILING", "0") == "1":
+    # Development only: ?profile=1 returns a pyinstrument report. Added innermost, so auth still applies.
+    from middlewares.profiling_middleware import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)
 app.add_middleware(AuthMiddleware)
 app.add_middleware(TraceMiddleware)
-app.add_middleware(SlowAPIMiddleware)
+# Query results are large, repetitive JSON; compress bodies over 1 KB (only for clients sending Accept-Encoding: gzip)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 cors_origins_str = os.getenv("CORS_ALLOWED_ORIGINS", "*")
-cors_origins = [origin.strip() for origin in cors_origins_str.split(",")] if cors_origins_str else ["*"]
+cors_origins = [origin.strip() for origin in cors_origins_str.split(",") if origin.strip()] if cors_origins_str else ["*"]
 
+# Concrete methods/headers (what the frontend sends) instead of wildcards; max_age lets browsers cache preflights
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type", "X-Request-ID"],
+    expose_headers=["X-Request-ID"],
+    max_age=int(os.getenv("CORS_MAX_AGE", "600")),
 )
 
 @app.exception_handler(BaseServiceException)
@@ -152,17 +215,13 @@ async def service_exception_handler(request: Request, exc: BaseServiceException)
         }
     )
 
-from authentication.router import router as auth_router
-app.include_router(auth_router, tags=["Authentication"])
-
-from query_execution.router import router as query_router
-app.include_router(query_router, tags=["Query Execution"])
-
-from admin.router import router as admin_router
-app.include_router(admin_router, tags=["Admin"])
-
-from workspaces.router import router as workspace_router
-app.include_router(workspace_router, tags=["Workspace"])
+for router, tag in (
+    (auth_router, "Authentication"),
+    (query_router, "Query Execution"),
+    (admin_router, "Admin"),
+    (workspace_router, "Workspace"),
+):
+    app.include_router(router, tags=[tag])
 
 # from static_files.router import router as static_router
 # app.include_router(static_router, tags=["Static Files"])
@@ -182,5 +241,8 @@ if __name__ == "__main__":
         host=os.getenv("HOST", "0.0.0.0"),
         port=int(os.getenv("PORT", 8080)),
         workers=int(os.getenv("WORKERS", 1)),
-        reload=os.getenv("DEBUG", "True").lower() == "true"
+        reload=DEBUG,
+        # Pin the fast event loop / HTTP parser instead of relying on auto-detection (uvloop has no Windows build)
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools"
     )
\ No newline at end of file
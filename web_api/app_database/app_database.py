@@ -2,16 +2,29 @@
 Application Database Manager
 Application database operations (user, log, workspace CRUD)
 """
-from .config import DATABASE_URL
+from .config import (
+    DATABASE_URL,
+    APP_DB_POOL_SIZE,
+    APP_DB_MAX_OVERFLOW,
+    APP_DB_POOL_TIMEOUT,
+    APP_DB_POOL_RECYCLE,
+    ACTION_LOG_BATCH_SIZE
+)
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from datetime import datetime
+import asyncio
 from contextlib import asynccontextmanager
 from sqlalchemy.sql import select
+from sqlalchemy import insert, update, lambda_stmt, text
+from sqlalchemy.exc import DBAPIError
 
-from .models import User, ActionLogging, LoginLogging, Base, Databases, BlacklistedToken, MaskingRule
+from .models import User, ActionLogging, LoginLogging, Base, Databases, BlacklistedToken, MaskingRule, QueryData
 from .schemas import UserCreate
 from typing import Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class AppDatabase:
@@ -30,12 +43,16 @@ class AppDatabase:
             "pool_pre_ping": False
         }
         
+        # Connections opened by warm_up(); SQLite shares a single connection
+        self.warm_up_connections: int = 1
+
         if not DATABASE_URL.startswith("sqlite"):
+            self.warm_up_connections = APP_DB_POOL_SIZE
             kwargs.update({
-                "pool_size": 20,
-                "max_overflow": 30,
-                "pool_timeout": 20,
-                "pool_recycle": 3600
+                "pool_size": APP_DB_POOL_SIZE,
+                "max_overflow": APP_DB_MAX_OVERFLOW,
+                "pool_timeout": APP_DB_POOL_TIMEOUT,
+                "pool_recycle": APP_DB_POOL_RECYCLE
             })
 
         self.app_engine = create_async_engine(
@@ -43,7 +60,72 @@ class AppDatabase:
             **kwargs
         )
 
-        self.AsyncSessionLocal = async_sessionmaker(autocommit=False, autoflush=True, bind=self.app_engine)
+        # One engine and sessionmaker per process; get_app_db only checks a session out of it.
+        # expire_on_commit=False: objects read after a commit (e.g. returned to the router) do not
+        # trigger a reload SELECT for every attribute. autoflush=False: queries do not flush pending
+        # changes first; code that needs generated IDs before commit calls flush() explicitly.
+        self.AsyncSessionLocal = async_sessionmaker(
+            autocommit=False, autoflush=False, expire_on_commit=False, bind=self.app_engine
+        )
+
+        # Bumped whenever the set of queries waiting for approval changes (see mark_approvals_changed)
+        self.approvals_version: int = 0
+
+        # Strong references to fire-and-forget log writes (see update_log_in_background)
+        self._pending_log_tasks: set[asyncio.Task] = set()
+
+        # create_log rows waiting for the batch writer, each with the future that receives its ID.
+        # Created on first use and recreated when create_log runs on a different event loop (see create_log)
+        self._log_queue: "asyncio.Queue[tuple[dict, asyncio.Future]] | None" = None
+        self._log_writer: asyncio.Task | None = None
+        self._log_loop: asyncio.AbstractEventLoop | None = None
+
+    async def get_user_by_id(self, user_id: int) -> User | None:
+        """
+        Returns the user with the given ID.
+        Not cached across requests, so is_admin and deletions take effect on the next request;
+        get_current_user keeps the loaded row for the rest of its request.
+        
+        Args:
+            user_id: ID of the user
+        
+        Returns:
+            User | None: The user, or None if it does not exist
+        """
+        async with self.get_app_db() as db:
+            return await db.get(User, user_id)
+
+    async def warm_up(self) -> None:
+        """
+        Opens warm_up_connections pooled connections at once and returns them to the pool,
+        so the first burst of requests does not pay for connection setup.
+        
+        Raises:
+            Exception: If no connection could be opened (the database is unreachable)
+        """
+        opened = await asyncio.gather(
+            *(self.app_engine.connect().start() for _ in range(self.warm_up_connections)),
+            return_exceptions=True
+        )
+        connections = [conn for conn in opened if not isinstance(conn, BaseException)]
+        failures = [conn for conn in opened if isinstance(conn, BaseException)]
+        try:
+            await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in connections))
+        finally:
+            await asyncio.gather(*(conn.close() for conn in connections))
+
+        if failures:
+            if not connections:
+                raise failures[0]
+            logger.warning("AppDatabase warm-up opened %s of %s connections: %s",
+                           len(connections), len(opened), failures[0])
+
+    def mark_approvals_changed(self):
+        """
+        Invalidates cached pending-approval lists built from this database.
+        Call after committing a change to a QueryData status.
+        """
+        self.approvals_version += 1
 
     @asynccontextmanager
     async def get_app_db(self):
@@ -56,12 +138,38 @@ class AppDatabase:
             finally:
                 await session.close()
 
+    @asynccontextmanager
+    async def tx(self):
+        """
+        Async session already inside a transaction: commits on success, rolls back on error.
+        Replaces get_app_db() followed by db.begin() for single-transaction writes.
+        """
+        async with self.AsyncSessionLocal.begin() as session:
+            yield session
+
     async def create_tables(self):
         """
         Creates all tables in the database if they don't exist.
+        Indexes added to the models after a table was created are created as well;
+        create_all only emits them together with a new table.
         """
+        def create_missing_indexes(connection):
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    if not index.unique:
+                        index.create(connection, checkfirst=True)
+                        continue
+                    # Rows that already violate a new unique index must not stop startup; report them instead
+                    try:
+                        with connection.begin_nested():
+                            index.create(connection, checkfirst=True)
+                    except DBAPIError as e:
+                        logger.error("Could not create unique index %s on %s; remove the duplicate rows: %s",
+                                     index.name, table.name, e)
+
         async with self.app_engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(create_missing_indexes)
 
     async def create_user(self, db: AsyncSession, user: UserCreate):
         """
@@ -88,7 +196,8 @@ class AppDatabase:
             "message": "Registration successful! Redirecting to login page..."
         }
 
-    async def create_log(self, user: User, query: str, machine_name: str, approved_execution: bool = False):
+    async def create_log(self, user: User, query: str, machine_name: str, approved_execution: bool = False,
+                         query_date: datetime | None = None):
         """
         Creates query execution log (initial record)
         
@@ -96,29 +205,147 @@ class AppDatabase:
             user: User executing the query
             query: Executed SQL query
             machine_name: SQL Server instance name
+            approved_execution: Whether the execution runs under an admin approval
+            query_date: Execution start (default: now); pass the same value to update_log
         
         Returns:
-            ActionLogging: Created log record
+            int: Created log ID
         
         Note:
-            Log is created initially, result is updated with update_log
+            Log is created initially, result is updated with update_log.
+            Rows are written by a single writer task (see _write_action_logs); logs created concurrently
+            share one INSERT, so the caller waits for one round trip no matter how many queries start.
         """
-        async with self.get_app_db() as db:
-            async with db.begin():
-                created_log = ActionLogging(
-                    user_id = user.id,
-                    username = user.username,
-                    query_date = datetime.now(),
-                    query = query,
-                    machine_name = machine_name,
-                    approved_execution = approved_execution
-                )
-                db.add(created_log)
-                await db.flush()
-                log_id = created_log.id
-            return log_id
+        loop = asyncio.get_running_loop()
+        if self._log_queue is None or self._log_loop is not loop:
+            # The queue and writer of a previous loop (e.g. an earlier test or lifespan) are unusable here
+            self._log_queue = asyncio.Queue()
+            self._log_writer = None
+            self._log_loop = loop
+        if self._log_writer is None or self._log_writer.done():
+            self._log_writer = asyncio.create_task(self._write_action_logs(), name="action_log_writer")
+
+        created_log = {
+            "user_id": user.id,
+            "username": user.username,
+            "query_date": query_date or datetime.now(),
+            "query": query,
+            "machine_name": machine_name,
+            "approved_execution": approved_execution
+        }
+        log_id = loop.create_future()
+        self._log_queue.put_nowait((created_log, log_id))
+        return await log_id
+
+    async def _write_action_logs(self):
+        """
+        Writer loop behind create_log. Takes whatever rows are queued (up to ACTION_LOG_BATCH_SIZE),
+        inserts them in one executemany with RETURNING and hands each caller its ID.
+        A single waiting row is written immediately; there is no batching delay.
+        If a batch fails, its rows are retried one by one so one bad row only fails its own caller.
+        """
+        queue = self._log_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < ACTION_LOG_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            try:
+                try:
+                    self._resolve_log_ids(batch, await self._insert_action_logs([row for row, _ in batch]))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if len(batch) == 1:
+                        raise
+                    logger.warning("Writing %d query logs in one batch failed, retrying row by row: %s", len(batch), e)
+                    for item in batch:
+                        try:
+                            self._resolve_log_ids([item], await self._insert_action_logs([item[0]]))
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as row_error:
+                            self._fail_log_ids([item], row_error)
+            except asyncio.CancelledError:
+                for _, log_id in batch:
+                    log_id.cancel()
+                raise
+            except Exception as e:
+                self._fail_log_ids(batch, e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _insert_action_logs(self, rows: list[dict]) -> list[int]:
+        """
+        Inserts ActionLogging rows in one transaction and returns their IDs in the order of rows.
+        sort_by_parameter_order makes the "insertmanyvalues" batches return IDs in parameter order;
+        SQLAlchemy supports this with RETURNING (OUTPUT inserted.id) on SQL Server IDENTITY columns
+        through pyodbc/aioodbc since 2.0.10, as well as on SQLite and PostgreSQL.
+        """
+        async with self.tx() as db:
+            result = await db.execute(
+                insert(ActionLogging).returning(ActionLogging.id, sort_by_parameter_order=True),
+                rows
+            )
+            return list(result.scalars().all())
+
+    def _resolve_log_ids(self, batch: list[tuple[dict, asyncio.Future]], log_ids: list[int]):
+        if len(log_ids) != len(batch):
+            # Never guess which row got which ID; callers store it in their update_log calls
+            self._fail_log_ids(batch, RuntimeError(
+                f"INSERT returned {len(log_ids)} query log IDs for {len(batch)} rows"
+            ))
+            return
+        for (_, log_id), inserted_id in zip(batch, log_ids):
+            if not log_id.done():
+                log_id.set_result(inserted_id)
+
+    def _fail_log_ids(self, batch: list[tuple[dict, asyncio.Future]], error: Exception):
+        logger.error("Writing %d query logs failed: %s", len(batch), error)
+        for _, log_id in batch:
+            if not log_id.done():
+                log_id.set_exception(error)
     
-    async def update_log(self, log_id, successfull: bool, error: str = None, row_count: int = None, applied_masking_rules: str = None):
+    def update_log_in_background(self, **log_fields) -> asyncio.Task:
+        """
+        Schedules update_log without waiting for it, so the caller can respond immediately.
+        Only for the outcome of a query whose start record create_log has already committed.
+        Failures are logged; drain_log_tasks() waits for outstanding writes (called on shutdown).
+        
+        Args:
+            **log_fields: Arguments for update_log
+        
+        Returns:
+            asyncio.Task: The scheduled write
+        """
+        return self._track_log_task(self.update_log(**log_fields))
+
+    def _track_log_task(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._pending_log_tasks.add(task)
+        task.add_done_callback(self._on_log_task_done)
+        return task
+
+    def _on_log_task_done(self, task: asyncio.Task):
+        self._pending_log_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background audit log write failed", exc_info=task.exception())
+
+    async def drain_log_tasks(self):
+        """
+        Waits for all scheduled background log writes to finish, then stops the create_log writer.
+        """
+        if self._pending_log_tasks:
+            await asyncio.gather(*self._pending_log_tasks, return_exceptions=True)
+        if (self._log_writer is not None and not self._log_writer.done()
+                and self._log_loop is asyncio.get_running_loop()):
+            await self._log_queue.join()
+            self._log_writer.cancel()
+            await asyncio.gather(self._log_writer, return_exceptions=True)
+
+    async def update_log(self, log_id, successfull: bool, error: str = None, row_count: int = None, applied_masking_rules: str = None,
+                         query_date: datetime | None = None):
         """
         Updates query execution log (result record)
         
@@ -128,27 +355,40 @@ class AppDatabase:
             error: Error message (if failed)
             row_count: Returned row count (if successful)
             applied_masking_rules: JSON string of applied masking rules (optional)
+            query_date: The query_date given to create_log; lets a successful update skip reading the row
         
         Note:
             - If failed: ErrorMessage and isSuccessfull are updated
             - If successful: ExecutionDurationMS, isSuccessfull and row_count are updated
+            - Failed updates, and successful ones with query_date, are a single UPDATE statement
         """
-        async with self.get_app_db() as db:
-            async with db.begin():
-                result = await db.execute(select(ActionLogging).where(ActionLogging.id == log_id))
-                log = result.scalars().first()
-
-                if log:
-                    if not successfull:
-                        log.ErrorMessage = error
-                        log.isSuccessfull = False
-                    else:
-                        duration = datetime.now() - log.query_date
-                        log.ExecutionDurationMS = int(duration.total_seconds() * 1000)
-                        log.isSuccessfull = True
-                        log.row_count = row_count
-                        if applied_masking_rules:
-                            log.applied_masking_rules = applied_masking_rules
+        values: Dict[str, Any] | None = None
+        if not successfull:
+            values = {"ErrorMessage": error, "isSuccessfull": False}
+        elif query_date is not None:
+            duration = datetime.now() - query_date
+            values = {
+                "ExecutionDurationMS": int(duration.total_seconds() * 1000),
+                "isSuccessfull": True,
+                "row_count": row_count
+            }
+            if applied_masking_rules:
+                values["applied_masking_rules"] = applied_masking_rules
+
+        async with self.tx() as db:
+            if values is not None:
+                await db.execute(update(ActionLogging).where(ActionLogging.id == log_id).values(**values))
+                return
+
+            # Successful execution without a known start time: read query_date from the row
+            log = await db.get(ActionLogging, log_id)
+            if log:
+                duration = datetime.now() - log.query_date
+                log.ExecutionDurationMS = int(duration.total_seconds() * 1000)
+                log.isSuccessfull = True
+                log.row_count = row_count
+                if applied_masking_rules:
+                    log.applied_masking_rules = applied_masking_rules
 
     async def create_login_log(self, user_id: int, client_ip):
         """
@@ -161,14 +401,13 @@ class AppDatabase:
         Note:
             logout_date is initially NULL, updated with update_login_log on logout
         """
-        async with self.get_app_db() as db:
-            async with db.begin():
-                created_log = LoginLogging(
-                    user_id = user_id,
-                    login_date = datetime.now(),
-                    client_ip = client_ip
-                )
-                db.add(created_log)
+        async with self.tx() as db:
+            created_log = LoginLogging(
+                user_id = user_id,
+                login_date = datetime.now(),
+                client_ip = client_ip
+            )
+            db.add(created_log)
 
     async def update_login_log(self, user_id: int):
         """
@@ -182,20 +421,20 @@ class AppDatabase:
             - Updates logout_date and login_duration_ms
             - Prints warning if active record is not found
         """
-        async with self.get_app_db() as db:
-            async with db.begin():
-                result = await db.execute(
-                    select(LoginLogging)
-                    .where(LoginLogging.user_id == user_id)
-                    .where(LoginLogging.logout_date.is_(None))
-                )
-                log = result.scalars().first()
-                if log:
-                    log.logout_date = datetime.now()
-                    duration = datetime.now() - log.login_date
-                    log.login_duration_ms = int(duration.total_seconds() * 1000)
-                else:
-                    print(f"Active login record NOT found for user {user_id}")
+        async with self.tx() as db:
+            # lambda_stmt: the statement is built and cache-keyed once; user_id becomes a bound parameter
+            result = await db.execute(lambda_stmt(
+                lambda: select(LoginLogging)
+                .where(LoginLogging.user_id == user_id)
+                .where(LoginLogging.logout_date.is_(None))
+            ))
+            log = result.scalars().first()
+            if log:
+                log.logout_date = datetime.now()
+                duration = datetime.now() - log.login_date
+                log.login_duration_ms = int(duration.total_seconds() * 1000)
+            else:
+                logger.warning("Active login record NOT found for user %s", user_id)
         
     async def get_db_info(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -222,43 +461,55 @@ class AppDatabase:
                 }
             }
         """
-        async with self.get_app_db() as db:
-            async with db.begin():
-                result = await db.execute(
-                    select(Databases)
-                )
-                databases = result.scalars().all()
-                db_info : Dict[str, Dict[str, Any]] = {}
+        async with self.tx() as db:
+            # Only the three columns used below, as plain rows (no ORM instances or identity map)
+            result = await db.execute(lambda_stmt(
+                lambda: select(Databases.servername, Databases.technology, Databases.database_name)
+            ))
+            db_info : Dict[str, Dict[str, Any]] = {}
                 
-                for database in databases:
-                    servername = database.servername
-                    if servername not in db_info:
-                        db_info[servername] = {
-                            "databases": [],
-                            "technology": database.technology
-                        }
-                    db_info[servername]["databases"].append(database.database_name)
-                return db_info
+            for servername, technology, database_name in result:
+                server_info = db_info.get(servername)
+                if server_info is None:
+                    server_info = db_info[servername] = {
+                        "databases": [],
+                        "technology": technology
+                    }
+                server_info["databases"].append(database_name)
+            return db_info
 
     async def blacklist_token(self, jti: str, expires_at: datetime) -> None:
         """
         Registers a new blacklisted JTI token upon user logout.
         """
-        async with self.get_app_db() as db:
-            async with db.begin():
-                blacklisted = BlacklistedToken(jti=jti, expires_at=expires_at)
-                db.add(blacklisted)
+        async with self.tx() as db:
+            blacklisted = BlacklistedToken(jti=jti, expires_at=expires_at)
+            db.add(blacklisted)
 
     async def is_token_blacklisted(self, jti: str) -> bool:
         """
         Checks if a JTI token has been blacklisted.
         """
+        async with self.get_app_db() as db:
+            # Existence probe: project only the PK and stop at the first match (TOP 1 on MSSQL).
+            # Runs on every authenticated request; lambda_stmt caches the construct, jti becomes a bound parameter
+            blacklisted_id = await db.scalar(lambda_stmt(
+                lambda: select(BlacklistedToken.id).where(BlacklistedToken.jti == jti).limit(1)
+            ))
+            return blacklisted_id is not None
+
+    async def get_pending_query_targets(self) -> list[tuple[str, str]]:
+        """
+        Returns the distinct (servername, database_name) pairs of queries waiting for approval.
+        Used to warm target connections before an admin previews or approves them.
+        """
         async with self.get_app_db() as db:
             result = await db.execute(
-                select(BlacklistedToken).where(BlacklistedToken.jti == jti)
+                select(QueryData.servername, QueryData.database_name)
+                .where(QueryData.status == "waiting_for_approval")
+                .distinct()
             )
-            blacklisted = result.scalars().first()
-            return blacklisted is not None
+            return [(servername, database_name) for servername, database_name in result.all()]
 
     async def get_masking_rules(self, database_id: int) -> list[MaskingRule]:
         """
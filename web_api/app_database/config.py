@@ -8,6 +8,9 @@ Environment Variables:
     DB_USER: SQL Server username (default: "sa")
     DB_PASSWORD: SQL Server password (default: "")
     APP_DATABASE_URL: Full connection string (optional override)
+    APP_DB_POOL_SIZE / APP_DB_MAX_OVERFLOW / APP_DB_POOL_TIMEOUT: Connection pool sizing (default: 20 / 30 / 20)
+    APP_DB_POOL_RECYCLE: Seconds before a pooled connection is replaced (default: 1800)
+    ACTION_LOG_BATCH_SIZE: Maximum number of query logs written by one INSERT (default: 500)
 """
 import os
 from dotenv import load_dotenv
@@ -28,4 +31,14 @@ DATABASE_URL = os.getenv(
         "&TrustServerCertificate=yes"
         "&connection timeout=30"
     )
-)
\ No newline at end of file
+)
+
+# Connection pool settings (ignored for SQLite). Connections are not pinged on checkout;
+# pool_recycle retires them before typical server/firewall idle timeouts instead.
+APP_DB_POOL_SIZE = int(os.getenv("APP_DB_POOL_SIZE", "20"))
+APP_DB_MAX_OVERFLOW = int(os.getenv("APP_DB_MAX_OVERFLOW", "30"))
+APP_DB_POOL_TIMEOUT = int(os.getenv("APP_DB_POOL_TIMEOUT", "20"))
+APP_DB_POOL_RECYCLE = int(os.getenv("APP_DB_POOL_RECYCLE", "1800"))
+
+# Query logs created while an INSERT is in flight are written together by the next one
+ACTION_LOG_BATCH_SIZE = int(os.getenv("ACTION_LOG_BATCH_SIZE", "500"))
@@ -6,7 +6,7 @@ import base64
 import os
 import re
 import bcrypt
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text, Index, text
 from sqlalchemy.dialects.mssql import DATETIME2, VARCHAR, NVARCHAR, UNIQUEIDENTIFIER, TEXT as MSSQL_TEXT
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.types import TypeDecorator
@@ -27,6 +27,8 @@ class EncryptedText(TypeDecorator):
     Uses QUERY_ENCRYPTION_KEY environment variable.
     """
     impl = Text
+    # Stateless per instance, so statements using this type can be kept in SQLAlchemy's compiled cache
+    cache_ok = True
     
     _fernet = None
 
@@ -134,6 +136,21 @@ class QueryData(Base):
     User query storage model.
     """
     __tablename__ = "QueryData"
+    __table_args__ = (
+        # Filtered index for the admin approval list; most rows are in other states. The list
+        # query must compare status against the same literal (not a bound parameter) for SQL
+        # Server to use it. Keyed on (status, id) so dialects without filtered indexes (MySQL)
+        # get the composite equivalent; id is the join key into the unique Workspaces.query_id,
+        # and only the pending rows are then sorted by Workspaces.id for the page.
+        Index(
+            "ix_querydata_status_pending",
+            "status",
+            "id",
+            mssql_where=text("status = 'waiting_for_approval'"),
+            postgresql_where=text("status = 'waiting_for_approval'"),
+            sqlite_where=text("status = 'waiting_for_approval'")
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("Users.id"), nullable=False)
     servername = Column(String(50))
@@ -142,6 +159,8 @@ class QueryData(Base):
     uuid = Column(AppUUID, nullable=False, index=True)
     status = Column(String(50), nullable=False)
     risk_type = Column(String(50), nullable=True)
+    workspace = relationship("Workspace", back_populates="query_data", uselist=False)
+    user = relationship("User")
     
 class Workspace(Base):
     """
@@ -154,7 +173,7 @@ class Workspace(Base):
     description = Column(String(255), nullable=True)
     query_id = Column(Integer, ForeignKey("QueryData.id"), nullable=False, unique=True)
     show_results = Column(Boolean, nullable=True, default=None)
-    query_data = relationship("QueryData")
+    query_data = relationship("QueryData", back_populates="workspace")
 
 class Databases(Base):
     __tablename__ = "Databases"
@@ -165,6 +184,11 @@ class Databases(Base):
     db_username = Column(String(100), nullable=True)
     db_password = Column(EncryptedText, nullable=True)
 
+    __table_args__ = (
+        # A target database is registered once; enforced here so concurrent add_database calls cannot both insert
+        Index("ux_databases_server_database", "servername", "database_name", unique=True),
+    )
+
 class MaskingRule(Base):
     """
     Table and column level masking rules defined by admin.
@@ -20,6 +20,9 @@ from dependencies import get_app_db, get_db_provider
 from app_database.app_database import AppDatabase
 from database_provider import DatabaseProvider
 from app_database.models import User
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api")
 
@@ -68,11 +71,13 @@ async def login(
             httponly=True,
             max_age=config.COOKIE_TOKEN_EXPIRE_MINUTES
         )
-        
-        client_ip: str = request.client.host if request.client else "unknown"
-        await app_db.create_login_log(user_id=user_id, client_ip=client_ip)
-        
-        return {"access_token": token}
+
+    # Written after the lookup session is released, but before responding: logout's
+    # update_login_log must find this row even when it arrives right after the login
+    client_ip: str = request.client.host if request.client else "unknown"
+    await app_db.create_login_log(user_id=user_id, client_ip=client_ip)
+
+    return {"access_token": token}
 
 
 @router.post("/register")
@@ -127,7 +132,7 @@ async def register(
 
 
 @router.get("/me", response_model=schemas.User)
-async def read_users_me(current_user: User = Depends(get_current_user)) -> schemas.User:
+async def read_users_me(current_user: User = Depends(get_current_user)) -> dict[str, Any]:
     """
     Returns current authenticated user information.
     
@@ -135,12 +140,12 @@ async def read_users_me(current_user: User = Depends(get_current_user)) -> schem
         current_user: The authenticated user instance.
         
     Returns:
-        schemas.User: The user details schema.
+        dict[str, Any]: The user details, validated once against schemas.User by response_model.
     """
-    return schemas.User(
-        username=current_user.username,
-        is_admin=current_user.is_admin if current_user.is_admin is not None else False
-    )
+    return {
+        "username": current_user.username,
+        "is_admin": current_user.is_admin if current_user.is_admin is not None else False
+    }
 
 
 @router.post("/logout")
@@ -176,7 +181,7 @@ async def logout(
                 expires_at = datetime.fromtimestamp(exp, tz=timezone.utc)
                 await app_db.blacklist_token(jti=jti, expires_at=expires_at)
         except Exception as e:
-            print(f"Error blacklisting token on logout: {e}")
+            logger.exception("Error blacklisting token on logout: %s", e)
 
     # Clear token from cookie
     response.delete_cookie(
@@ -11,12 +11,14 @@ from datetime import datetime, timedelta, UTC
 from typing import Optional
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Request
-from sqlalchemy.future import select
 
 from authentication import config
 from app_database.models import User
 from authentication.schemas import TokenData
 from app_database.app_database import AppDatabase
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -90,41 +92,49 @@ async def get_current_user(
     # Retrieve AppDatabase instance from request state to prevent circular imports
     app_db: AppDatabase = request.app.state.app_db
 
-    # Retrieve token solely from cookies
-    token = request.cookies.get("access_token")
-    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid token",
         headers={"WWW-Authenticate": "Bearer"}
     )
-    
-    if not token:
-        raise credentials_exception
-    
-    try:
-        payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
-        user_id: str = payload.get("sub")
-        jti: str = payload.get("jti")
-        if user_id is None:
+
+    # AuthMiddleware has already decoded the token and checked the blacklist for this request
+    verified_payload: dict | None = getattr(request.state, "token_payload", None)
+    if verified_payload is not None:
+        token_data = TokenData(sub=verified_payload["sub"])
+    else:
+        # Retrieve token solely from cookies
+        token = request.cookies.get("access_token")
+
+        if not token:
             raise credentials_exception
-        token_data = TokenData(sub=user_id)
-    except JWTError as e:
-        print(f"JWT Error: {str(e)}")
-        raise credentials_exception
-        
-    # Check if token is blacklisted
-    if jti:
-        is_blacklisted = await app_db.is_token_blacklisted(jti)
-        if is_blacklisted:
+
+        try:
+            payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
+            user_id: str = payload.get("sub")
+            jti: str = payload.get("jti")
+            if user_id is None:
+                raise credentials_exception
+            token_data = TokenData(sub=user_id)
+        except JWTError as e:
+            logger.info("JWT Error: %s", e)
             raise credentials_exception
+
+        # Check if token is blacklisted
+        if jti:
+            is_blacklisted = await app_db.is_token_blacklisted(jti)
+            if is_blacklisted:
+                raise credentials_exception
     
-    # Retrieve user from AppDatabase
-    async with app_db.get_app_db() as db:
-        result = await db.execute(select(User).filter(User.id == int(token_data.sub)))
-        user = result.scalars().first()
+    # Loaded once per request: FastAPI caches this dependency within a request, and request.state
+    # covers callers outside the dependency graph. Never reused across requests, so a demoted or
+    # deleted user loses access immediately.
+    user: User | None = getattr(request.state, "current_user", None)
+    if user is None:
+        user = await app_db.get_user_by_id(int(token_data.sub))
     
     if user is None:
         raise credentials_exception
     
+    request.state.current_user = user
     return user
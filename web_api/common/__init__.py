@@ -1,6 +1,7 @@
 from .exceptions import BaseServiceException
 from .logging_config import setup_logging
 from .limiter import limiter
+from .responses import ORJSONResponse
 
-__all__ = ["BaseServiceException", "setup_logging", "limiter"]
+__all__ = ["BaseServiceException", "setup_logging", "limiter", "ORJSONResponse"]
 
@@ -2,7 +2,10 @@
 Logging Configuration Module
 Configures structured logging with dynamic Trace ID and User ID tracking using contextvars.
 """
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from contextvars import ContextVar
 from typing import Any
 
@@ -19,10 +22,16 @@ class ContextFilter(logging.Filter):
         record.user_id = user_id_var.get()
         return True
 
+_queue_listener: QueueListener | None = None
+
 def setup_logging() -> None:
     """
     Initializes and configures the logging system with a custom formatter and context filters.
+
+    Records are handed to a QueueHandler and written to the console by a QueueListener thread,
+    so formatting and stream I/O never block the event loop.
     """
+    global _queue_listener
     log_format: str = "%(asctime)s [%(levelname)s] [Trace: %(trace_id)s] [User: %(user_id)s] %(name)s: %(message)s"
     
     # Configure root logger
@@ -33,7 +42,7 @@ def setup_logging() -> None:
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
         
-    # Console handler
+    # Console handler (runs on the listener thread)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     
@@ -41,11 +50,23 @@ def setup_logging() -> None:
     formatter = logging.Formatter(log_format)
     console_handler.setFormatter(formatter)
     
-    # Inject ContextFilter
+    # Queue handler (runs on the calling thread)
+    queue_handler = QueueHandler(queue.SimpleQueue())
+    queue_handler.setLevel(logging.INFO)
+    
+    # Inject ContextFilter on the queue handler: contextvars are only visible on the calling side
     context_filter = ContextFilter()
-    console_handler.addFilter(context_filter)
+    queue_handler.addFilter(context_filter)
+    
+    root_logger.addHandler(queue_handler)
     
-    root_logger.addHandler(console_handler)
+    if _queue_listener is not None:
+        atexit.unregister(_queue_listener.stop)
+        _queue_listener.stop()
+    _queue_listener = QueueListener(queue_handler.queue, console_handler, respect_handler_level=True)
+    _queue_listener.start()
+    # Flush queued records on interpreter exit
+    atexit.register(_queue_listener.stop)
     
     # Suppress verbose loggers from libraries if needed
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
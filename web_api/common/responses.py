@@ -0,0 +1,39 @@
+"""
+Response Classes Module
+orjson-backed JSON response for endpoints that return large query result sets.
+"""
+import datetime
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+
+def _orjson_default(value: Any) -> Any:
+    """
+    Serializes driver types that orjson does not handle natively.
+    Mirrors FastAPI's jsonable_encoder behaviour for the same types.
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode(errors="replace")
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Unlike fastapi.responses.ORJSONResponse, values such as Decimal or bytes returned by
+    target database drivers are converted instead of raising a TypeError.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
@@ -25,6 +25,14 @@ CENTRAL_DB_PASSWORD: str = os.getenv("CENTRAL_DB_PASSWORD", DB_PASSWORD)
 # Default: 1800 seconds (30 minutes)
 TIME_INTERVAL_FOR_CACHE = int(os.getenv("ENGINE_CACHE_TTL_SECONDS", "1800"))
 
+# Connection pool settings for each cached target engine
+ENGINE_POOL_SIZE = int(os.getenv("ENGINE_POOL_SIZE", "5"))
+ENGINE_MAX_OVERFLOW = int(os.getenv("ENGINE_MAX_OVERFLOW", "10"))
+ENGINE_POOL_TIMEOUT = int(os.getenv("ENGINE_POOL_TIMEOUT", "30"))
+ENGINE_POOL_RECYCLE = int(os.getenv("ENGINE_POOL_RECYCLE", "1800"))
+# Validate pooled connections with a lightweight ping on checkout (evicts dead connections)
+ENGINE_POOL_PRE_PING = os.getenv("ENGINE_POOL_PRE_PING", "False").lower() == "true"
+
 # Technology to Driver mapping
 TECHNOLOGY_DRIVER_MAP = {
     "mssql": "aioodbc",
@@ -3,8 +3,9 @@ Database Provider Module
 Manages database engines caching and session provisioning using centralized credentials.
 All functions and classes are strictly typed.
 """
-from sqlalchemy.ext.asyncio import async_sessionmaker
-from typing import Dict, Any
+import asyncio
+import logging
+from typing import Dict, Any, Iterable
 import app_database.models as models
 from database_provider.config import (
     create_connection_string, 
@@ -15,6 +16,8 @@ from database_provider.config import (
 from contextlib import asynccontextmanager
 from .engine_cache import EngineCache
 
+logger = logging.getLogger(__name__)
+
 class DatabaseProvider:
     """
     Manages SQL Server database connections.
@@ -48,7 +51,42 @@ class DatabaseProvider:
         Yields:
             AsyncSession: SQLAlchemy async session.
         """
+        conn_str = self._connection_string(servername, database_name)
+
+        # Sessions check out connections from the cached engine's pool instead of connecting each time
+        AsyncSessionLocal = await self.engine_cache.get_session_factory(conn_str, owner_id=user.id)
+        async with AsyncSessionLocal() as session:
+            try:
+                yield session
+            finally:
+                await session.close()
+
+    async def warm_up(self, targets: Iterable[tuple[str, str]]) -> None:
+        """
+        Opens one pooled connection per (servername, database_name) pair concurrently,
+        so the first real session on each target skips connection setup.
+        Failures are logged and ignored; warm-up is best effort.
+        
+        Args:
+            targets: (servername, database_name) pairs to warm.
+        """
+        async def warm(servername: str, database_name: str) -> None:
+            try:
+                engine = await self.engine_cache.get_engine(self._connection_string(servername, database_name))
+                async with engine.connect():
+                    pass
+            except Exception as e:
+                logger.warning(f"Connection warm-up failed for {servername}/{database_name}: {e}")
+
+        await asyncio.gather(*(warm(servername, database_name) for servername, database_name in set(targets)))
+
+    def _connection_string(self, servername: str, database_name: str) -> str:
+        """
+        Validates the target against db_info and builds its central-credential connection string.
         
+        Raises:
+            ValueError: If the server or database is not registered.
+        """
         # Server validation
         if servername not in self.db_info:
             raise ValueError(
@@ -72,7 +110,7 @@ class DatabaseProvider:
         tech = server_info.get("technology", "mssql")
         driver = get_driver_for_technology(tech)
 
-        conn_str = create_connection_string(
+        return create_connection_string(
             tech=tech,
             driver=driver,
             servername=servername,
@@ -80,15 +118,6 @@ class DatabaseProvider:
             username=CENTRAL_DB_USER,
             password=CENTRAL_DB_PASSWORD,
         )
-        
-        engine = await self.engine_cache.get_engine(conn_str, owner_id=user.id)
-
-        AsyncSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        async with AsyncSessionLocal() as session:
-            try:
-                yield session
-            finally:
-                await session.close()
 
     async def start_cache_loop(self) -> None:
         """
@@ -2,15 +2,26 @@ import hashlib
 from typing import Dict, Optional
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 import asyncio
-from .config import TIME_INTERVAL_FOR_CACHE
+from .config import (
+    TIME_INTERVAL_FOR_CACHE,
+    ENGINE_POOL_SIZE,
+    ENGINE_MAX_OVERFLOW,
+    ENGINE_POOL_TIMEOUT,
+    ENGINE_POOL_RECYCLE,
+    ENGINE_POOL_PRE_PING
+)
 from pydantic import BaseModel, Field
 from datetime import datetime
+import logging
 
 from typing import Dict, Optional, Any
 
+logger = logging.getLogger(__name__)
+
 class EngineCacheEntry(BaseModel):
     """Cached engine entry with metadata."""
     engine: Any
+    session_factory: Any = None
     last_accessed: datetime = Field(default_factory=datetime.now)
     owner_id: Optional[int] = None
     
@@ -56,16 +67,25 @@ class EngineCache:
         
         if idle_engines:
             oldest_key = min(idle_engines.keys(), key=lambda k: idle_engines[k].last_accessed)
-            print(f"[EngineCache] LRU: Evicting idle engine: {oldest_key}")
+            logger.info("LRU: Evicting idle engine: %s", oldest_key)
         else:
             oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k].last_accessed)
-            print(f"[EngineCache] WARNING: Cache full & all active. Force evicting: {oldest_key}")
+            logger.warning("Cache full & all active. Force evicting: %s", oldest_key)
         
         entry = self._cache.pop(oldest_key)
         await entry.engine.dispose()
         self._stats["engine_count"] -= 1
 
     async def get_engine(self, url: str, owner_id: int = None) -> AsyncEngine:
+        entry = await self._get_entry(url, owner_id)
+        return entry.engine
+
+    async def get_session_factory(self, url: str, owner_id: int = None) -> async_sessionmaker[AsyncSession]:
+        """Returns the session factory bound to the cached (pooled) engine for this URL."""
+        entry = await self._get_entry(url, owner_id)
+        return entry.session_factory
+
+    async def _get_entry(self, url: str, owner_id: int = None) -> EngineCacheEntry:
         hash_key = self._hash_key(url=url)
 
         async with self.lock:
@@ -73,22 +93,23 @@ class EngineCache:
             if hash_key in self._cache:
                 self._cache[hash_key].last_accessed = datetime.now()
                 self._stats["request_count"] += 1
-                return self._cache[hash_key].engine
+                return self._cache[hash_key]
             
             if self._stats["engine_count"] >= self._max_engines:
                 await self._evict_lru()
                         
             engine = create_async_engine(
                 url,
-                pool_size=5,
-                max_overflow=10,
-                pool_timeout=30,
-                pool_recycle=1800,
-                pool_pre_ping=False
+                pool_size=ENGINE_POOL_SIZE,
+                max_overflow=ENGINE_MAX_OVERFLOW,
+                pool_timeout=ENGINE_POOL_TIMEOUT,
+                pool_recycle=ENGINE_POOL_RECYCLE,
+                pool_pre_ping=ENGINE_POOL_PRE_PING
             )
 
             entry = EngineCacheEntry(
                 engine=engine, 
+                session_factory=async_sessionmaker(autocommit=False, autoflush=False, bind=engine),
                 last_accessed=datetime.now(),
                 owner_id=owner_id
             )
@@ -97,7 +118,7 @@ class EngineCache:
             self._stats["engine_count"] += 1
             self._stats["request_count"] += 1
             
-            return engine
+            return entry
         
     def get_cache_stats(self) -> Dict:
         return self._stats
@@ -106,7 +127,7 @@ class EngineCache:
         if not self._running:
             self._cleanup_task = asyncio.create_task(self._loop())
             self._running = True
-            print("[EngineCache] Background cleanup loop started.")
+            logger.info("Background cleanup loop started.")
 
     async def _loop(self):
         """Zaman aşımına uğrayanları temizleyen döngü (TTL)"""
@@ -131,12 +152,12 @@ class EngineCache:
                             self._stats["engine_count"] -= 1
                     
                     if stale_keys:
-                        print(f"[EngineCache] TTL Cleanup: Removed {len(stale_keys)} idle engines.")
+                        logger.info("TTL Cleanup: Removed %d idle engines.", len(stale_keys))
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                print(f"[EngineCache] Error in loop: {e}")
+                logger.exception("Error in loop: %s", e)
 
     async def stop_loop(self):
         if self._running:
@@ -153,7 +174,7 @@ class EngineCache:
                     await entry.engine.dispose()
                 self._cache.clear()
                 self._stats["engine_count"] = 0
-            print(f"[EngineCache] Stopped and cleared all engines.")
+            logger.info("Stopped and cleared all engines.")
     
     async def close_user_engines(self, user_id: int):
         """Belirli bir kullanıcı ID'sine ait motorları kapatır"""
@@ -171,4 +192,4 @@ class EngineCache:
                 entry = self._cache.pop(key)
                 await entry.engine.dispose()
                 self._stats["engine_count"] -= 1
-                print(f"[EngineCache] Closed engine for user_id: {user_id}")
+                logger.info("Closed engine for user_id: %s", user_id)
@@ -14,7 +14,7 @@ from query_execution.services import QueryService
 from workspaces.services import WorkspaceService
 from workspaces.exceptions import WorkspaceNotFoundError, WorkspaceAccessDeniedError
 
-def get_app_db(request: Request) -> AppDatabase:
+async def get_app_db(request: Request) -> AppDatabase:
     """
     Returns the AppDatabase instance.
     Usage: app_db: AppDatabase = Depends(get_app_db)
@@ -22,7 +22,7 @@ def get_app_db(request: Request) -> AppDatabase:
     return request.app.state.app_db
 
 
-def get_db_provider(request: Request) -> DatabaseProvider:
+async def get_db_provider(request: Request) -> DatabaseProvider:
     """
     Returns the DatabaseProvider instance.
     Usage: db_provider: DatabaseProvider = Depends(get_db_provider)
@@ -32,34 +32,44 @@ def get_db_provider(request: Request) -> DatabaseProvider:
 
 # removed session cache and fernet dependencies as password caching is eliminated
 
-def get_query_service(request: Request) -> QueryService:
+# All dependencies are async def: FastAPI runs sync dependencies in the threadpool,
+# which costs a thread hop per dependency on every request.
+
+from notification import NotificationService
+
+async def get_notification_service(request: Request) -> NotificationService:
+    """
+    Returns the NotificationService instance.
+    Usage: notification_service: NotificationService = Depends(get_notification_service)    
+    """
+    return NotificationService()
+
+
+async def get_query_service(app_db: AppDatabase = Depends(get_app_db),
+                            db_provider: DatabaseProvider = Depends(get_db_provider),
+                            notification_service: NotificationService = Depends(get_notification_service)) -> QueryService:
     """
     Returns the QueryService instance.
     Usage: query_service: QueryService = Depends(get_query_service)
     """
-    app_db = get_app_db(request)
-    db_provider = get_db_provider(request)
-    notification_service = get_notification_service(request)
     return QueryService(database_provider=db_provider, app_db=app_db, notification_service=notification_service)
 
 
-def get_workspace_service(request: Request) -> WorkspaceService:
+async def get_workspace_service(app_db: AppDatabase = Depends(get_app_db)) -> WorkspaceService:
     """
     Returns the WorkspaceService instance.
     Usage: workspace_service: WorkspaceService = Depends(get_workspace_service)
     """
-    app_db = get_app_db(request)
     return WorkspaceService(app_db=app_db)
 
 from admin.services import AdminService
 
-def get_admin_service(request: Request) -> AdminService:
+async def get_admin_service(app_db: AppDatabase = Depends(get_app_db),
+                            db_provider: DatabaseProvider = Depends(get_db_provider)) -> AdminService:
     """
     Returns the AdminService instance.
     Usage: admin_service: AdminService = Depends(get_admin_service)
     """
-    app_db = get_app_db(request)
-    db_provider = get_db_provider(request)
     return AdminService(app_db=app_db, db_provider=db_provider)
 
 
@@ -81,13 +91,3 @@ async def ensure_owner(workspace_id: int,
         if ws.user_id != current_user.id:
             raise WorkspaceAccessDeniedError("You don't own this workspace.")
         return ws
-
-
-from notification import NotificationService
-
-def get_notification_service(request: Request) -> NotificationService:
-    """
-    Returns the NotificationService instance.
-    Usage: notification_service: NotificationService = Depends(get_notification_service)    
-    """
-    return NotificationService()
\ No newline at end of file
@@ -2,98 +2,131 @@
 Authentication Middleware
 Her HTTP request için JWT token doğrulama ve session kontrolü yapar
 """
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.middleware.base import RequestResponseEndpoint
 from starlette.responses import Response as StarletteResponse
 from starlette.responses import RedirectResponse
-from fastapi import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 import os
 from authentication.services import verify_token, get_user_id_from_payload
-from fastapi.exceptions import HTTPException
 from common.logging_config import user_id_var
+import logging
 
-class AuthMiddleware(BaseHTTPMiddleware):
+logger = logging.getLogger(__name__)
+
+SKIP_AUTH_PATHS: tuple[str, ...] = (
+    "/login",
+    "/register",
+    "/api/login",
+    "/api/register",
+    "/health"
+)
+
+ACCESS_TOKEN_PREFIX: bytes = b"access_token="
+
+class AuthMiddleware:
     """
-    JWT token validation middleware.
-    
+    JWT token validation middleware (pure ASGI).
+
     For every request:
         1. Public endpoint check (login, register, health)
         2. Retrieves JWT token from access_token cookie
         3. Validates the token
         4. If invalid/missing, responds with 401 (for APIs) or redirects to /login (for web pages)
+
+    Written against the raw ASGI interface instead of BaseHTTPMiddleware, so requests are not
+    wrapped in an extra task and no Request/Response objects are built on the pass-through path.
+    The verified payload is left in request.state for get_current_user.
     """
-    
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> StarletteResponse:
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Processes the request, checking authentication.
-        
+
         Args:
-            request: The incoming HTTP request.
-            call_next: The next middleware/endpoint handler.
-        
-        Returns:
-            StarletteResponse: The HTTP response object.
+            scope: ASGI connection scope.
+            receive: ASGI receive channel.
+            send: ASGI send channel.
         """
-        skip_auth_paths: list[str] = [
-            "/login", 
-            "/register", 
-            "/api/login", 
-            "/api/register",
-            "/health"
-        ]
-        
-        if any(request.url.path.startswith(path) for path in skip_auth_paths):
-            return await call_next(request)
-        
-        token: str | None = request.cookies.get("access_token")
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path: str = scope["path"]
+        if path.startswith(SKIP_AUTH_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        token: str | None = self._get_token(scope)
         if not token:
-            if request.url.path.startswith("/api/"):
-                return StarletteResponse(
+            if path.startswith("/api/"):
+                response: StarletteResponse = StarletteResponse(
                     content='{"detail":"Token required"}',
                     status_code=401,
                     media_type="application/json"
                 )
-            return RedirectResponse(url="/login", status_code=302)
+            else:
+                response = RedirectResponse(url="/login", status_code=302)
+            await response(scope, receive, send)
+            return
+
         try:
             payload: dict | None = verify_token(token)
             if not payload:
-                raise HTTPException(status_code=401, detail="Invalid token")
+                raise ValueError("Invalid token")
             user_id: str | None = get_user_id_from_payload(payload=payload)
             if not user_id:
-                raise HTTPException(status_code=401, detail="Invalid token")
-                
+                raise ValueError("Invalid token")
+
             # Check JTI blacklist
             jti = payload.get("jti")
             if jti:
-                app_db = request.app.state.app_db
+                app_db = scope["app"].state.app_db
                 is_blacklisted = await app_db.is_token_blacklisted(jti)
                 if is_blacklisted:
-                    raise HTTPException(status_code=401, detail="Token has been revoked")
+                    raise ValueError("Token has been revoked")
         except Exception as e:
-            print(f"Auth verification failed: {e}")
-            if request.url.path.startswith("/api/"):
-                return StarletteResponse(
+            logger.info("Auth verification failed: %s", e)
+            if path.startswith("/api/"):
+                response = StarletteResponse(
                     content='{"detail":"Invalid token"}',
                     status_code=401,
                     media_type="application/json"
                 )
-            response: RedirectResponse = RedirectResponse(url="/login", status_code=302)
-            response.delete_cookie(
-                key="access_token",
-                secure=os.getenv("COOKIE_SECURE", "False").lower() == "true",
-                samesite="strict",
-                httponly=True
-            )
-            return response
-        
-        user_token = None
-        if user_id:
-            request.state.user_id = user_id
-            user_token = user_id_var.set(user_id)
-        
+            else:
+                response = RedirectResponse(url="/login", status_code=302)
+                response.delete_cookie(
+                    key="access_token",
+                    secure=os.getenv("COOKIE_SECURE", "False").lower() == "true",
+                    samesite="strict",
+                    httponly=True
+                )
+            await response(scope, receive, send)
+            return
+
+        # request.state is backed by scope["state"]
+        state: dict = scope.setdefault("state", {})
+        state["user_id"] = user_id
+        state["token_payload"] = payload
+        user_token = user_id_var.set(user_id)
+
         try:
-            response: StarletteResponse = await call_next(request)
-            return response
+            await self.app(scope, receive, send)
         finally:
-            if user_token:
-                user_id_var.reset(user_token)
\ No newline at end of file
+            user_id_var.reset(user_token)
+
+    @staticmethod
+    def _get_token(scope: Scope) -> str | None:
+        """
+        Reads the access_token cookie straight from the raw ASGI headers.
+        Only the one cookie is looked up, in bytes; the rest of the header is never decoded or parsed.
+        """
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                for cookie in value.split(b";"):
+                    cookie = cookie.strip()
+                    if cookie.startswith(ACCESS_TOKEN_PREFIX):
+                        return cookie[len(ACCESS_TOKEN_PREFIX):].decode("latin-1") or None
+                return None
+        return None
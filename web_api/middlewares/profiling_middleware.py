@@ -0,0 +1,44 @@
+"""
+Profiling Middleware Module
+Development-only per-request profiler: any request with ?profile=1 returns a pyinstrument HTML report
+instead of its normal response. Installed only when PROFILING=1 (see app.py).
+"""
+from urllib.parse import parse_qs
+
+from starlette.responses import HTMLResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware that profiles a request with pyinstrument when asked to.
+
+    The wrapped endpoint still runs in full (including its database calls); its response is discarded
+    and replaced with the flame graph. pyinstrument is imported on construction, so it is only
+    required when profiling is enabled.
+    """
+
+    def __init__(self, app: ASGIApp, interval: float = 0.001):
+        from pyinstrument import Profiler
+
+        self.app = app
+        self.interval = interval
+        self._profiler_class = Profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not parse_qs(scope["query_string"].decode("latin-1")).get("profile"):
+            await self.app(scope, receive, send)
+            return
+
+        async def discard(message: Message) -> None:
+            pass
+
+        profiler = self._profiler_class(interval=self.interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+
+        response = HTMLResponse(profiler.output_html())
+        await response(scope, receive, send)
@@ -2,6 +2,9 @@ from notification.config import message_format, approval_message_format, SLACK_U
 from slack_integration.schemas import create_approval_message
 import httpx
 from typing import List, Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class NotificationService:
@@ -37,7 +40,7 @@ class NotificationService:
         Returns True on success, False on failure.
         """
         if not self.slack_url:
-            print("[Notification] SLACK_URL tanımlı değil. Mesaj gönderilmedi.")
+            logger.warning("SLACK_URL tanımlı değil. Mesaj gönderilmedi.")
             return False
 
         headers = {"Content-Type": "application/json; charset=utf-8"}
@@ -58,10 +61,10 @@ class NotificationService:
             async with httpx.AsyncClient(timeout=8.0) as client:
                 resp = await client.post(self.slack_url, headers=headers, json=payload)
                 if resp.status_code >= 400:
-                    print(f"[Notification] Slack webhook hatası: {resp.status_code} - {resp.text}")
+                    logger.error("Slack webhook hatası: %s - %s", resp.status_code, resp.text)
                     return False
                 return True
         except httpx.RequestError as e:
-            print(f"[Notification] Slack isteği başarısız: {type(e).__name__}: {e}")
+            logger.exception("Slack isteği başarısız: %s: %s", type(e).__name__, e)
             return False
 
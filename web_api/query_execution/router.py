@@ -55,9 +55,9 @@ async def multiple_query(
     request: query_models.MultipleQueryRequest,
     current_user: User = Depends(get_current_user),
     query_service: QueryService = Depends(get_query_service)
-) -> query_models.MultipleQueryResponse:
+) -> dict[str, Any]:
     """
-    Executes multiple SQL queries sequentially.
+    Executes multiple SQL queries sequentially, stopping at the first failure.
     
     Args:
         request: The multiple SQL queries request payload.
@@ -65,7 +65,7 @@ async def multiple_query(
         query_service: The query execution service instance.
         
     Returns:
-        query_models.MultipleQueryResponse: The list of results for each executed query.
+        dict[str, Any]: The list of results for each executed query.
     """
     if len(request.execution_info) > config.MULTIPLE_QUERY_COUNT:
         raise HTTPException(
@@ -73,6 +73,8 @@ async def multiple_query(
             detail=f"Too many queries. Maximum: {config.MULTIPLE_QUERY_COUNT}"
         )
     
+    # Sequential on purpose: statements in a batch may depend on each other (e.g. UPDATE then SELECT),
+    # and a failed or rejected query must stop the ones after it from running.
     results: List[dict[str, Any]] = []
     
     for execution_info in request.execution_info:
@@ -85,7 +87,7 @@ async def multiple_query(
         )
         results.append(result)
     
-    return query_models.MultipleQueryResponse(results=results)
+    return {"results": results}
 
 
 @router.get("/database_information", response_model=query_models.DatabaseInformationResponse)
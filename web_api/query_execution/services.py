@@ -68,9 +68,10 @@ class QueryService:
             Dict[str, Any]: The execution results, rows, or error details.
         """
         log_id: int | None = None
+        query_date: datetime = datetime.now()
         try:
             logger.info(f"Initiating query execution on server '{server_name}', database '{database_name}'")
-            log_id = await self.app_db.create_log(user=user, query=query, machine_name=server_name)
+            log_id = await self.app_db.create_log(user=user, query=query, machine_name=server_name, query_date=query_date)
             
             # Fetch persistent database masking rules & merge with user ad-hoc rules
             db_id = None
@@ -132,6 +133,7 @@ class QueryService:
                         
                         workspace_id: int = workspace.id
                         await db_session.commit()
+                        self.app_db.mark_approvals_changed()
                         
                     logger.info(f"Query saved for approval - Workspace ID: {workspace_id}, UUID: {query_uuid}")
                 except Exception as save_exc:
@@ -183,7 +185,8 @@ class QueryService:
                     result_data = {
                         "response_type": "data",
                         "data": raw_data,
-                        "message": message
+                        "message": message,
+                        "error": None
                     }
                 else:
                     row_count = result.rowcount if result.rowcount is not None else 0
@@ -191,7 +194,8 @@ class QueryService:
                     result_data = {
                         "response_type": "data",
                         "data": [],
-                        "message": message
+                        "message": message,
+                        "error": None
                     }
                 
                 applied_rules_str = json.dumps(list(masking_cols)) if masking_cols else None
@@ -199,7 +203,8 @@ class QueryService:
                     log_id=log_id,
                     successfull=True,
                     row_count=row_count,
-                    applied_masking_rules=applied_rules_str
+                    applied_masking_rules=applied_rules_str,
+                    query_date=query_date
                 )
                 
                 if row_count > config.MAX_ROW_COUNT_WARNING:
@@ -1,4 +1,5 @@
 import os
+import logging
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -17,5 +18,7 @@ SLACK_ADMIN_CHANNEL = os.getenv("SLACK_ADMIN_CHANNEL")
 
 # Konfigürasyon kontrolü
 if not all([SLACK_BOT_TOKEN, SLACK_APP_TOKEN, SLACK_ADMIN_CHANNEL]):
-    print("UYARI: Slack entegrasyonu için gerekli environment değişkenleri eksik!")
-    print("Lütfen .env dosyasında SLACK_BOT_TOKEN, SLACK_APP_TOKEN ve SLACK_ADMIN_CHANNEL tanımlı olduğundan emin olun.")
\ No newline at end of file
+    logging.getLogger(__name__).warning(
+        "Slack entegrasyonu için gerekli environment değişkenleri eksik! "
+        "Lütfen .env dosyasında SLACK_BOT_TOKEN, SLACK_APP_TOKEN ve SLACK_ADMIN_CHANNEL tanımlı olduğundan emin olun."
+    )
\ No newline at end of file
@@ -3,7 +3,10 @@ from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 from slack_integration.config import SLACK_APP_TOKEN, SLACK_BOT_TOKEN
 from app_database.app_database import AppDatabase
 from app_database.models import QueryData, Workspace
-from sqlalchemy import select
+from sqlalchemy import select, update
+import logging
+
+logger = logging.getLogger(__name__)
 
 class SlackListener:
     def __init__(self, app_db: AppDatabase):
@@ -23,12 +26,42 @@ class SlackListener:
 
     async def start(self):
         if not SLACK_APP_TOKEN:
-            print("⚠️ SLACK_APP_TOKEN missing, Slack Socket Mode could not be started.")
+            logger.warning("SLACK_APP_TOKEN missing, Slack Socket Mode could not be started.")
             return
             
         self.handler = AsyncSocketModeHandler(self.app, SLACK_APP_TOKEN)
         await self.handler.start_async()
 
+    async def stop(self):
+        """
+        Closes the Socket Mode connection, if one was opened.
+        """
+        if self.handler:
+            await self.handler.close_async()
+            self.handler = None
+
+    async def _set_query_status(self, session, request_id: str, status: str, show_results: bool, description: str) -> bool:
+        """
+        Updates the QueryData row identified by its UUID and its Workspace with bulk ORM UPDATEs,
+        without loading either row into the session. Returns False if no query matched.
+        """
+        query_update = await session.execute(
+            update(QueryData)
+            .where(QueryData.uuid == request_id)
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+        if query_update.rowcount == 0:
+            return False
+
+        await session.execute(
+            update(Workspace)
+            .where(Workspace.query_id.in_(select(QueryData.id).where(QueryData.uuid == request_id)))
+            .values(show_results=show_results, description=description)
+            .execution_options(synchronize_session=False)
+        )
+        return True
+
     async def handle_approve_with_results(self, ack, body, respond):
         await ack()
         user_id = body["user"]["id"]
@@ -42,27 +75,23 @@ class SlackListener:
         
         async with self.app_db.get_app_db() as session:
             try:
-                stmt = select(QueryData).where(QueryData.uuid == request_id)
-                result = await session.execute(stmt)
-                query_data = result.scalar_one_or_none()
+                updated = await self._set_query_status(
+                    session,
+                    request_id,
+                    status="approved_with_results",
+                    show_results=True,
+                    description="Approved by admin via Slack"
+                )
                 
-                if query_data:
-                    query_data.status = "approved_with_results"
-                    
-                    stmt_ws = select(Workspace).where(Workspace.query_id == query_data.id)
-                    result_ws = await session.execute(stmt_ws)
-                    workspace = result_ws.scalar_one_or_none()
-                    if workspace:
-                        workspace.show_results = True
-                        workspace.description = "Approved by admin via Slack"
-                        
+                if updated:
                     await session.commit()
-                    print(f"Query {request_id} approved by Slack user {user_id}")
+                    self.app_db.mark_approvals_changed()
+                    logger.info("Query %s approved by Slack user %s", request_id, user_id)
                 else:
-                    print(f"Query {request_id} not found in database.")
+                    logger.warning("Query %s not found in database.", request_id)
             except Exception as e:
                 await session.rollback()
-                print(f"Error processing approval for {request_id}: {e}")
+                logger.exception("Error processing approval for request %s", request_id)
 
     async def handle_reject_query(self, ack, body, respond):
         await ack()
@@ -77,25 +106,19 @@ class SlackListener:
         
         async with self.app_db.get_app_db() as session:
             try:
-                stmt = select(QueryData).where(QueryData.uuid == request_id)
-                result = await session.execute(stmt)
-                query_data = result.scalar_one_or_none()
+                updated = await self._set_query_status(
+                    session,
+                    request_id,
+                    status="rejected",
+                    show_results=False,
+                    description="Rejected by admin via Slack"
+                )
                 
-                if query_data:
-                    query_data.status = "rejected"
-                    
-                    stmt_ws = select(Workspace).where(Workspace.query_id == query_data.id)
-                    result_ws = await session.execute(stmt_ws)
-                    workspace = result_ws.scalar_one_or_none()
-                    if workspace:
-                        workspace.show_results = False
-                        workspace.description = "Rejected by admin via Slack"
-                        
+                if updated:
                     await session.commit()
-                    print(f"Query {request_id} rejected by Slack user {user_id}")
+                    self.app_db.mark_approvals_changed()
+                    logger.info("Query %s rejected by Slack user %s", request_id, user_id)
             except Exception as e:
                 await session.rollback()
-                print(f"Error processing rejection for {request_id}: {e}")
- 
-    async def execute_query(self, ack, body, client):
-        await ack()
+                logger.exception("Error processing rejection for request %s", request_id)
+
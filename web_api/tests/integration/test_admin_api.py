@@ -7,9 +7,12 @@ from httpx import AsyncClient
 from unittest.mock import MagicMock, AsyncMock, patch
 from contextlib import asynccontextmanager
 from sqlalchemy.future import select
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import app
-from app_database.models import User, Workspace, QueryData, Databases
+from app_database.models import User, Workspace, QueryData, Databases, ActionLogging
+from query_execution.config import MAX_ROW_COUNT_LIMIT
 
 @pytest.fixture
 def mock_db_session():
@@ -19,6 +22,10 @@ def mock_db_session():
     mock_session = AsyncMock()
     mock_result = MagicMock()
     mock_session.execute.return_value = mock_result
+    # Admin preview runs its statement on the sync connection via run_sync
+    mock_session.sync_connection = MagicMock()
+    mock_session.sync_connection.execute.return_value = mock_result
+    mock_session.connection.return_value.run_sync.side_effect = lambda fn: fn(mock_session.sync_connection)
     
     @asynccontextmanager
     async def fake_get_session(user, servername, database_name):
@@ -127,6 +134,36 @@ async def test_admin_database_registration(async_client: AsyncClient):
     assert "already exists" in response_dup.json()["message"]
 
 
+@pytest.mark.asyncio
+async def test_admin_database_registration_race(async_client: AsyncClient):
+    """
+    Tests that (servername, database_name) is unique in the metadata DB and that an insert losing
+    a concurrent registration race is reported as DATABASE_ALREADY_EXISTS.
+    """
+    await create_user_and_login(async_client, "admin_race@example.com", "admin_race", make_admin=True)
+
+    app_db = app.state.app_db
+    async with app_db.get_app_db() as db:
+        db.add(Databases(servername="race-server", database_name="race_db", technology="mssql"))
+        await db.commit()
+        db.add(Databases(servername="race-server", database_name="race_db", technology="mssql"))
+        with pytest.raises(IntegrityError):
+            await db.commit()
+
+    # The other request won between the NOT EXISTS check and the insert
+    with patch.object(
+        AsyncSession, "execute",
+        AsyncMock(side_effect=IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed")))
+    ):
+        response = await async_client.post("/api/admin/add_database", json={
+            "servername": "race-server-2",
+            "database_name": "race_db",
+            "tech_name": "mssql"
+        })
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "DATABASE_ALREADY_EXISTS"
+
+
 @pytest.mark.asyncio
 async def test_admin_query_approval_workflow(async_client: AsyncClient, mock_db_session):
     """
@@ -189,6 +226,10 @@ async def test_admin_query_approval_workflow(async_client: AsyncClient, mock_db_
     assert approve_response.json()["success"] is True
     assert approve_response.json()["status"] == "approved_with_results"
     
+    # Approved query must drop off the (cached) approval list immediately
+    list_response = await admin_client.get("/api/admin/queries_to_approve")
+    assert list_response.json()["waiting_approvals"] == []
+    
     # Verify regular user can now execute it
     mock_result.returns_rows = False
     mock_result.rowcount = 5
@@ -199,6 +240,45 @@ async def test_admin_query_approval_workflow(async_client: AsyncClient, mock_db_
     assert "5 rows affected" in exec_response.json()["message"]
 
 
+@pytest.mark.asyncio
+async def test_admin_approval_list_pagination(async_client: AsyncClient):
+    """
+    Tests that the approval list is keyset-paginated on workspace_id via after_id / next_cursor.
+    """
+    regular_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(regular_client, "user_page@example.com", "user_page")
+
+    app_db = app.state.app_db
+    workspace_ids = []
+    for i in range(3):
+        create_response = await regular_client.post("/api/workspaces", json={
+            "name": f"Paged Workspace {i}",
+            "query": f"DELETE FROM paged_{i}",
+            "servername": "prod-server",
+            "database_name": "orders_db"
+        })
+        workspace_id = create_response.json()["workspace_id"]
+        workspace_ids.append(workspace_id)
+        async with app_db.get_app_db() as db:
+            ws = await db.get(Workspace, workspace_id)
+            qdata = await db.get(QueryData, ws.query_id)
+            qdata.status = "waiting_for_approval"
+            await db.commit()
+
+    admin_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(admin_client, "admin10@example.com", "admin10", make_admin=True)
+
+    first_page = (await admin_client.get("/api/admin/queries_to_approve?limit=2")).json()
+    assert [a["workspace_id"] for a in first_page["waiting_approvals"]] == workspace_ids[:2]
+    assert first_page["next_cursor"] == workspace_ids[1]
+
+    second_page = (await admin_client.get(
+        f"/api/admin/queries_to_approve?limit=2&after_id={first_page['next_cursor']}"
+    )).json()
+    assert [a["workspace_id"] for a in second_page["waiting_approvals"]] == workspace_ids[2:]
+    assert second_page["next_cursor"] is None
+
+
 @pytest.mark.asyncio
 async def test_admin_query_rejection(async_client: AsyncClient):
     """
@@ -243,3 +323,211 @@ async def test_admin_query_rejection(async_client: AsyncClient):
     exec_response = await regular_client.post(f"/api/execute_workspace/{workspace_id}")
     assert exec_response.status_code == 400
     assert exec_response.json()["error_code"] == "QUERY_REJECTED_BY_ANALYZER"
+
+
+@pytest.mark.asyncio
+async def test_admin_approve_missing_workspace(async_client: AsyncClient):
+    """
+    Tests that approving a non-existent workspace is translated into a 404 Not Found.
+    """
+    admin_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(admin_client, "admin4@example.com", "admin4", make_admin=True)
+
+    response = await admin_client.post("/api/admin/approve_query/99999", json={"show_results": True})
+    assert response.status_code == 404
+    assert response.json()["error_code"] == "WORKSPACE_NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_admin_reject_missing_workspace(async_client: AsyncClient):
+    """
+    Tests that rejecting a non-existent workspace returns 400 without touching any row.
+    """
+    admin_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(admin_client, "admin8@example.com", "admin8", make_admin=True)
+
+    response = await admin_client.post("/api/admin/reject_query/99999")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Workspace not found"
+
+
+@pytest.mark.asyncio
+async def test_admin_reject_retries_on_dropped_connection(async_client: AsyncClient):
+    """
+    Tests that a status update hitting a dead pooled connection is retried once on a fresh one.
+    """
+    regular_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(regular_client, "user_retry@example.com", "user_retry")
+    create_response = await regular_client.post("/api/workspaces", json={
+        "name": "Retry Workspace",
+        "query": "DROP TABLE retry_table",
+        "servername": "prod-server",
+        "database_name": "orders_db"
+    })
+    workspace_id = create_response.json()["workspace_id"]
+
+    admin_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(admin_client, "admin9@example.com", "admin9", make_admin=True)
+
+    original_execute = AsyncSession.execute
+    failures = []
+
+    async def flaky_execute(self, statement, *args, **kwargs):
+        if not failures and getattr(statement, "is_update", False):
+            failures.append(statement)
+            raise DBAPIError("UPDATE", {}, Exception("connection reset"), connection_invalidated=True)
+        return await original_execute(self, statement, *args, **kwargs)
+
+    with patch.object(AsyncSession, "execute", flaky_execute):
+        response = await admin_client.post(f"/api/admin/reject_query/{workspace_id}")
+
+    assert response.status_code == 200
+    assert len(failures) == 1
+
+    app_db = app.state.app_db
+    async with app_db.get_app_db() as db:
+        ws = await db.get(Workspace, workspace_id)
+        qdata = await db.get(QueryData, ws.query_id)
+        assert qdata.status == "rejected"
+        assert ws.description == "Rejected by admin"
+
+
+@pytest.mark.asyncio
+async def test_admin_preview_missing_workspace(async_client: AsyncClient):
+    """
+    Tests that previewing a non-existent workspace is translated into a 404 Not Found.
+    """
+    admin_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(admin_client, "admin5@example.com", "admin5", make_admin=True)
+
+    response = await admin_client.post("/api/admin/execute_for_preview/99999")
+    assert response.status_code == 404
+    assert response.json()["error_code"] == "WORKSPACE_NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_admin_preview_returns_rows(async_client: AsyncClient, mock_db_session):
+    """
+    Tests that an admin preview of a row-returning query exposes data, columns and row count.
+    """
+    mock_session, mock_result = mock_db_session
+
+    regular_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(regular_client, "user_prev@example.com", "user_prev")
+    create_payload = {
+        "name": "Preview Workspace",
+        "query": "SELECT id, name FROM customers",
+        "servername": "prod-server",
+        "database_name": "orders_db"
+    }
+    create_response = await regular_client.post("/api/workspaces", json=create_payload)
+    workspace_id = create_response.json()["workspace_id"]
+
+    admin_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(admin_client, "admin6@example.com", "admin6", make_admin=True)
+
+    mock_result.returns_rows = True
+    mock_result.keys.return_value = ["id", "name"]
+    mock_result.fetchmany.return_value = [
+        (1, "Alice"),
+        (2, "Bob")
+    ]
+
+    response = await admin_client.post(f"/api/admin/execute_for_preview/{workspace_id}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["response_type"] == "data"
+    assert body["columns"] == ["id", "name"]
+    assert body["data"] == [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}]
+    assert body["row_count"] == 2
+    assert body["message"] == "2 rows returned"
+
+    # Exactly one completed audit record is written for the preview (in the background)
+    await app.state.app_db.drain_log_tasks()
+    async with app.state.app_db.get_app_db() as db:
+        result = await db.execute(select(ActionLogging).where(ActionLogging.username == "admin6"))
+        logs = result.scalars().all()
+        assert len(logs) == 1
+        assert logs[0].isSuccessfull is True
+        assert logs[0].row_count == 2
+        assert logs[0].ExecutionDurationMS is not None
+
+
+@pytest.mark.asyncio
+async def test_admin_preview_truncates_and_closes_cursor(async_client: AsyncClient, mock_db_session):
+    """
+    Tests that a preview fetches at most MAX_ROW_COUNT_LIMIT + 1 rows of the original query text
+    with stream_results, closes the cursor and reports truncation.
+    """
+    mock_session, mock_result = mock_db_session
+
+    regular_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(regular_client, "user_trunc@example.com", "user_trunc")
+    query = "SELECT id FROM big_table -- keep this comment"
+    create_payload = {
+        "name": "Large Workspace",
+        "query": query,
+        "servername": "prod-server",
+        "database_name": "orders_db"
+    }
+    create_response = await regular_client.post("/api/workspaces", json=create_payload)
+    workspace_id = create_response.json()["workspace_id"]
+
+    admin_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(admin_client, "admin_trunc@example.com", "admin_trunc", make_admin=True)
+
+    mock_result.returns_rows = True
+    mock_result.keys.return_value = ["id"]
+    mock_result.fetchmany.return_value = [(i,) for i in range(MAX_ROW_COUNT_LIMIT + 1)]
+
+    response = await admin_client.post(f"/api/admin/execute_for_preview/{workspace_id}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["row_count"] == MAX_ROW_COUNT_LIMIT
+    assert len(body["data"]) == MAX_ROW_COUNT_LIMIT
+    assert body["message"] == f"Truncated to MAX_ROW_COUNT_LIMIT ({MAX_ROW_COUNT_LIMIT})"
+
+    # The stored text runs unchanged, rows are pulled once with a bound, and the cursor is closed
+    statement, = mock_session.sync_connection.execute.call_args.args
+    assert str(statement) == query
+    assert mock_session.sync_connection.execute.call_args.kwargs["execution_options"] == {"stream_results": True}
+    mock_result.fetchmany.assert_called_once_with(MAX_ROW_COUNT_LIMIT + 1)
+    mock_result.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_admin_preview_failure_is_logged(async_client: AsyncClient, mock_db_session):
+    """
+    Tests that a failing preview returns 400 and still records a failed ActionLogging entry.
+    """
+    mock_session, mock_result = mock_db_session
+
+    regular_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(regular_client, "user_fail@example.com", "user_fail")
+    create_payload = {
+        "name": "Failing Workspace",
+        "query": "SELECT broken FROM nowhere",
+        "servername": "prod-server",
+        "database_name": "orders_db"
+    }
+    create_response = await regular_client.post("/api/workspaces", json=create_payload)
+    workspace_id = create_response.json()["workspace_id"]
+
+    admin_client = AsyncClient(transport=async_client._transport, base_url="http://test")
+    await create_user_and_login(admin_client, "admin7@example.com", "admin7", make_admin=True)
+
+    mock_session.sync_connection.execute.side_effect = Exception("invalid object name 'nowhere'")
+
+    response = await admin_client.post(f"/api/admin/execute_for_preview/{workspace_id}")
+    assert response.status_code == 400
+    assert "nowhere" in response.json()["detail"]
+
+    await app.state.app_db.drain_log_tasks()
+    async with app.state.app_db.get_app_db() as db:
+        result = await db.execute(
+            select(ActionLogging).where(ActionLogging.username == "admin7").order_by(ActionLogging.id.desc())
+        )
+        log = result.scalars().first()
+        assert log is not None
+        assert log.isSuccessfull is False
+        assert "nowhere" in log.ErrorMessage
@@ -168,6 +168,41 @@ async def test_access_me_protected_route(async_client: AsyncClient):
     assert data["is_admin"] is False
 
 
+@pytest.mark.asyncio
+async def test_current_user_role_change_applies_immediately(async_client: AsyncClient):
+    """
+    Test that the authenticated user is not cached across requests: a role change in the DB
+    is visible on the very next request.
+    """
+    from sqlalchemy import select
+    from app_database.models import User
+
+    await async_client.post("/api/register", json={
+        "username": "role_user",
+        "email": "role@example.com",
+        "password": "StrongPassword123!"
+    })
+    await async_client.post("/api/login", json={
+        "email": "role@example.com",
+        "password": "StrongPassword123!"
+    })
+    response = await async_client.get("/api/me")
+    assert response.json()["is_admin"] is False
+
+    app_db = app.state.app_db
+    async with app_db.get_app_db() as db:
+        user = (await db.execute(select(User).where(User.email == "role@example.com"))).scalars().one()
+        user.is_admin = True
+        await db.commit()
+    assert (await async_client.get("/api/me")).json()["is_admin"] is True
+
+    async with app_db.get_app_db() as db:
+        user = (await db.execute(select(User).where(User.email == "role@example.com"))).scalars().one()
+        user.is_admin = False
+        await db.commit()
+    assert (await async_client.get("/api/me")).json()["is_admin"] is False
+
+
 @pytest.mark.asyncio
 async def test_access_me_invalid_token(async_client: AsyncClient):
     """
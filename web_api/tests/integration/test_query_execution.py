@@ -2,13 +2,15 @@
 Integration tests for query execution endpoints.
 Verifies SELECT and DML/non-SELECT query execution paths and safety.
 """
+import asyncio
 import pytest
 from httpx import AsyncClient
+from types import SimpleNamespace
 from unittest.mock import MagicMock, AsyncMock, patch
 from contextlib import asynccontextmanager
 
 from app import app
-from app_database.models import Databases
+from app_database.models import Databases, ActionLogging
 
 @pytest.fixture
 def mock_db_session():
@@ -126,3 +128,64 @@ async def test_dml_query_execution(async_client: AsyncClient, mock_db_session):
     assert resp_data["response_type"] == "data"
     assert resp_data["data"] == []
     assert resp_data["message"] == "3 rows affected"
+
+@pytest.mark.asyncio
+async def test_multiple_query_execution(async_client: AsyncClient, mock_db_session):
+    """
+    Test that /api/multiple_query runs every query and returns one result per query, in request order.
+    """
+    mock_session, mock_result = mock_db_session
+
+    await async_client.post("/api/register", json={
+        "username": "queryuser3",
+        "email": "query3@example.com",
+        "password": "StrongPassword123!"
+    })
+    await async_client.post("/api/login", json={
+        "email": "query3@example.com",
+        "password": "StrongPassword123!"
+    })
+
+    mock_result.returns_rows = False
+    mock_result.rowcount = 2
+
+    payload = {
+        "execution_info": [
+            {"query": "UPDATE users SET active = 1 WHERE age > 30", "servername": "server-a", "database_name": "db-a"},
+            {"query": "UPDATE users SET active = 0 WHERE age <= 30", "servername": "server-b", "database_name": "db-b"}
+        ]
+    }
+    response = await async_client.post("/api/multiple_query", json=payload)
+    assert response.status_code == 200, f"Multiple query execution failed: {response.text}"
+
+    results = response.json()["results"]
+    assert len(results) == 2
+    assert all(r["message"] == "2 rows affected" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_query_logs_get_their_own_ids(async_client: AsyncClient):
+    """
+    Test that query logs written by one batched INSERT hand every caller the ID of its own row,
+    and that a row failing inside a batch does not fail the other callers.
+    """
+    app_db = app.state.app_db
+    user = SimpleNamespace(id=1, username="loguser")
+
+    queries = [f"SELECT {i}" for i in range(20)]
+    # machine_name is NOT NULL: this row fails, the batch is retried row by row
+    results = await asyncio.gather(
+        *(app_db.create_log(user=user, query=q, machine_name="server-a") for q in queries),
+        app_db.create_log(user=user, query="SELECT 'bad'", machine_name=None),
+        return_exceptions=True
+    )
+    log_ids, failed = results[:-1], results[-1]
+    assert isinstance(failed, Exception)
+    assert all(isinstance(log_id, int) for log_id in log_ids)
+
+    async with app_db.get_app_db() as db:
+        for query, log_id in zip(queries, log_ids):
+            log = await db.get(ActionLogging, log_id)
+            assert log.query == query
+
+    await app_db.drain_log_tasks()
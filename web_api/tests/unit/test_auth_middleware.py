@@ -0,0 +1,24 @@
+import sys
+import os
+
+# Add the web_api directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from middlewares.auth_middleware import AuthMiddleware
+
+def _scope(*headers):
+    return {"type": "http", "headers": list(headers)}
+
+def test_get_token_reads_access_token_cookie():
+    """Test that only the access_token cookie is picked out of the raw Cookie header."""
+    scope = _scope(
+        (b"host", b"localhost"),
+        (b"cookie", b"theme=dark;access_token=abc.def.ghi; lang=tr")
+    )
+    assert AuthMiddleware._get_token(scope) == "abc.def.ghi"
+
+def test_get_token_missing_or_empty_cookie():
+    """Test that a missing header, a missing cookie or an empty value yields no token."""
+    assert AuthMiddleware._get_token(_scope((b"host", b"localhost"))) is None
+    assert AuthMiddleware._get_token(_scope((b"cookie", b"my_access_token=x; theme=dark"))) is None
+    assert AuthMiddleware._get_token(_scope((b"cookie", b"access_token="))) is None
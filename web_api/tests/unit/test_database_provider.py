@@ -0,0 +1,26 @@
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+import sys
+import os
+
+# Add the web_api directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from database_provider import DatabaseProvider
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_one_connection_per_target():
+    """Test that warm_up connects once per distinct registered target and skips unknown ones."""
+    provider = DatabaseProvider()
+    provider.set_db_info({"srv": {"databases": ["db1", "db2"], "technology": "mssql"}})
+
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__ = AsyncMock()
+    engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    provider.engine_cache.get_engine = AsyncMock(return_value=engine)
+
+    # Duplicate pair is warmed once; unregistered server is logged and ignored
+    await provider.warm_up([("srv", "db1"), ("srv", "db1"), ("srv", "db2"), ("unknown", "db1")])
+
+    assert provider.engine_cache.get_engine.await_count == 2
+    assert engine.connect.call_count == 2
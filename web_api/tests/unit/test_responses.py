@@ -0,0 +1,30 @@
+import sys
+import os
+import datetime
+from decimal import Decimal
+
+import orjson
+
+# Add the web_api directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from common.responses import ORJSONResponse
+
+def test_orjson_response_serializes_driver_types():
+    """Test that Decimal, bytes and datetime values from result sets are rendered instead of raising."""
+    response = ORJSONResponse({
+        "data": [{
+            "price": Decimal("10.50"),
+            "qty": Decimal("3"),
+            "blob": b"abc",
+            "created": datetime.datetime(2026, 1, 2, 3, 4, 5)
+        }]
+    })
+
+    body = orjson.loads(response.body)
+    row = body["data"][0]
+    assert row["price"] == 10.5
+    assert row["qty"] == 3
+    assert row["blob"] == "abc"
+    assert row["created"] == "2026-01-02T03:04:05"
+    assert response.media_type == "application/json"
@@ -58,7 +58,7 @@ async def get_workspaces(
     """
     async with app_db.get_app_db() as db:
         workspaces = await service.get_workspace_by_id(db, current_user.id)
-        return {"workspaces": workspaces}
+    return {"workspaces": workspaces}
 
 @router.delete("/workspaces/{workspace_id}")
 async def delete_workspace(
@@ -174,7 +174,7 @@ async def execute_workspace(
         db_provider: The database provider instance.
         
     Returns:
-        dict[str, Any]: The query execution results or error details.
+        dict[str, Any]: The query execution results.
     """
     # Delegate execution to WorkspaceService which enforces approval rules (using centralized credentials)
     ad_hoc = execution_request.ad_hoc_mask_columns if execution_request else None
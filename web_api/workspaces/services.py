@@ -4,6 +4,7 @@ User workspace (saved query) management operations
 """
 from typing import Any, List, Dict
 import json
+from datetime import datetime
 from app_database.models import QueryData, Workspace, Databases
 from app_database.app_database import AppDatabase
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -114,7 +115,7 @@ class WorkspaceService:
         for ws in workspaces:
             query_data = query_data_map.get(ws.query_id)
             if query_data:
-                print(f"[DEBUG] Workspace {ws.id}: status={query_data.status}, show_results={getattr(ws, 'show_results', None)}")
+                logger.debug("Workspace %s: status=%s, show_results=%s", ws.id, query_data.status, getattr(ws, 'show_results', None))
                 workspace_list.append(WorkspaceInfo(
                     id=ws.id,
                     name=ws.name,
@@ -141,8 +142,7 @@ class WorkspaceService:
             bool: True if successful, False otherwise
         """
         try:
-            workspace_result = await db.execute(select(Workspace).where(Workspace.id == workspace_id))
-            workspace = workspace_result.scalars().first()
+            workspace = await db.get(Workspace, workspace_id)
             if not workspace:
                 raise WorkspaceNotFoundError("Workspace not found")
             
@@ -151,12 +151,12 @@ class WorkspaceService:
             await db.delete(workspace)
             
             if query_id:
-                query_result = await db.execute(select(QueryData).where(QueryData.id == query_id))
-                query_data = query_result.scalars().first()
+                query_data = await db.get(QueryData, query_id)
                 if query_data:
                     await db.delete(query_data)
             
             await db.commit()
+            self.app_db.mark_approvals_changed()
             return True
         except BaseServiceException:
             raise
@@ -179,13 +179,11 @@ class WorkspaceService:
             bool: True if successful, False otherwise
         """
         try:
-            workspace_result = await db.execute(select(Workspace).where(Workspace.id == workspace_id))
-            workspace = workspace_result.scalars().first()
+            workspace = await db.get(Workspace, workspace_id)
             if not workspace:
                 raise WorkspaceNotFoundError("Workspace not found")
             
-            query_result = await db.execute(select(QueryData).where(QueryData.id == workspace.query_id))
-            query_data = query_result.scalars().first()
+            query_data = await db.get(QueryData, workspace.query_id)
             if not query_data:
                 raise WorkspaceNotFoundError("Query data not found for this workspace")
             
@@ -194,6 +192,7 @@ class WorkspaceService:
             if status:
                 query_data.status = status
             await db.commit()
+            self.app_db.mark_approvals_changed()
             return True
         except BaseServiceException:
             raise
@@ -214,15 +213,13 @@ class WorkspaceService:
         Returns:
             Dict | None: Workspace details or None
         """
-        workspace_result = await db.execute(select(Workspace).where(Workspace.id == workspace_id))
-        workspace = workspace_result.scalars().first()
+        workspace = await db.get(Workspace, workspace_id)
         if not workspace:
             raise WorkspaceNotFoundError("Workspace not found")
         if workspace.user_id != user_id:
             raise WorkspaceAccessDeniedError("You do not own this workspace")
             
-        query_result = await db.execute(select(QueryData).where(QueryData.id == workspace.query_id))
-        query_data = query_result.scalars().first()
+        query_data = await db.get(QueryData, workspace.query_id)
         if not query_data:
             raise WorkspaceNotFoundError("Query data not found for this workspace")
             
@@ -253,18 +250,21 @@ class WorkspaceService:
         Returns:
             dict[str, Any]: A dictionary containing execution status and data or error details.
         """
-        # Load workspace and query
+        # Load workspace, query and registered database id over a single session
         async with self.app_db.get_app_db() as db:
-            workspace_result = await db.execute(select(Workspace).where(Workspace.id == workspace_id))
-            workspace: Workspace | None = workspace_result.scalars().first()
-            if not workspace:
+            row = (await db.execute(
+                select(Workspace, QueryData)
+                .outerjoin(QueryData, QueryData.id == Workspace.query_id)
+                .where(Workspace.id == workspace_id)
+            )).first()
+            if not row:
                 raise WorkspaceNotFoundError("Workspace not found")
+            workspace: Workspace = row[0]
+            query_data: QueryData | None = row[1]
 
             if workspace.user_id != current_user.id:
                 raise WorkspaceAccessDeniedError("You do not own this workspace")
 
-            query_result = await db.execute(select(QueryData).where(QueryData.id == workspace.query_id))
-            query_data: QueryData | None = query_result.scalars().first()
             if not query_data:
                 raise WorkspaceNotFoundError("Query data not found for this workspace")
                 
@@ -272,22 +272,18 @@ class WorkspaceService:
             if not workspace.show_results or query_data.status != "approved_with_results":
                 raise QueryAnalysisRejectedError("This workspace is not approved for execution")
 
+            db_id: int | None = await db.scalar(
+                select(Databases.id).where(Databases.servername == query_data.servername, Databases.database_name == query_data.database_name).limit(1)
+            )
+
         log_id: int | None = None
+        query_date: datetime = datetime.now()
         try:
             logger.info(f"Executing approved workspace {workspace_id} on server '{query_data.servername}'")
-            log_id = await self.app_db.create_log(user=current_user, query=query_data.query, machine_name=query_data.servername, approved_execution=True)
+            log_id = await self.app_db.create_log(user=current_user, query=query_data.query, machine_name=query_data.servername, approved_execution=True, query_date=query_date)
 
             # Fetch persistent database masking rules & merge with user ad-hoc rules
-            db_id = None
             masking_cols = set()
-            async with self.app_db.get_app_db() as db_session:
-                db_result = await db_session.execute(
-                    select(Databases).where(Databases.servername == query_data.servername, Databases.database_name == query_data.database_name)
-                )
-                db_entry = db_result.scalars().first()
-                if db_entry:
-                    db_id = db_entry.id
-            
             if db_id:
                 rules = await self.app_db.get_masking_rules(db_id)
                 for rule in rules:
@@ -322,10 +318,10 @@ class WorkspaceService:
                       result_data = []
 
             applied_rules_str = json.dumps(list(masking_cols)) if masking_cols else None
-            await self.app_db.update_log(log_id=log_id, successfull=True, row_count=row_count, applied_masking_rules=applied_rules_str)
+            await self.app_db.update_log(log_id=log_id, successfull=True, row_count=row_count, applied_masking_rules=applied_rules_str, query_date=query_date)
             
             logger.info(f"Workspace {workspace_id} executed successfully. Result: {message}")
-            return {"response_type": "data", "data": result_data, "message": message}
+            return {"response_type": "data", "data": result_data, "message": message, "error": None}
 
         except BaseServiceException:
             raise